@@ -22,28 +22,84 @@ import csv
 import json
 import os
 import re
-import shlex
+import sqlite3
 import subprocess
 import sys
+import tempfile
+import threading
 import hashlib
+import heapq
+import importlib
+import mmap
+import pickle
 import platform
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import nullcontext
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
 from datetime import datetime
-from typing import List, Tuple, Dict, Optional
+from typing import List, Tuple, Dict, Optional, Sequence
 
-# Optional packages improve text extraction
+# Optional packages improve text extraction. They are heavy and rarely needed,
+# so they are imported on first use (see _optional_module):
+#   textract - handles .doc and .rtf (not required on macOS due to textutil)
+#   docx     - python-docx, handles .docx
+_OPTIONAL_MODULES: Dict[str, object] = {}
+
+try:
+    import orjson  # parses ffprobe output straight from bytes (falls back to json)
+except Exception:
+    orjson = None
 try:
-    import textract  # handles .doc and .rtf (not required on macOS due to textutil)
+    import ahocorasick  # single-pass band-name detection (falls back to regex scans)
 except Exception:
-    textract = None
+    ahocorasick = None
 try:
-    from docx import Document  # handles .docx
+    import re2  # google-re2: linear-time scans for the literal keyword sets (falls back to re)
 except Exception:
-    Document = None
+    re2 = None
 
 # ====== Formats ======
 VIDEO_EXTS = {".vob", ".ts", ".mpg", ".mpeg", ".m2ts", ".mp4", ".m4v", ".avi", ".mov", ".mkv", ".wmv"}
 TEXT_EXTS = {".txt", ".nfo", ".docx", ".doc", ".rtf"}
+MAX_NOTE_BYTES = 1024 * 1024  # plain-text notes beyond this are media dumps; parsing never needs more
+# Disc structure and extras folders are never shows themselves, so the walk skips them
+_EXCLUDED_DIR_NAMES = frozenset({"video_ts", "audio_ts", "info", "nfo", "docs", "artwork", "extras"})
+
+# ffprobe takes one input per process, so DVD segments are probed concurrently instead;
+# a probe is mostly process start-up and header I/O, so this is not tied to the core count
+FFPROBE_WORKERS = 8
+# Checksum inputs above this size are hashed from a read-only mapping (no userspace copy)
+MMAP_HASH_MIN = 16 * 1024 * 1024
+MMAP_HASH_SLICE = 4 * 1024 * 1024
+
+# Show folders are mostly stat/ffprobe waits, so thread pools can run well past the core count
+IO_THREAD_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+# Cap on live ffprobe children across the scan: thread workers each fan out over their
+# segments. The semaphore is per process, so _init_process_worker gives each process
+# worker its share of the cap
+FFPROBE_MAX_IN_FLIGHT = 16
+_FFPROBE_SLOTS = threading.BoundedSemaphore(FFPROBE_MAX_IN_FLIGHT)
+
+# ====== Output ======
+FIELDNAMES = (
+    "ShowID", "Artist", "ShowDate", "EventOrFestival", "VenueName", "City", "Country",
+    "RecordingType", "Generation", "Lineage", "SourceEquipment",
+    "FolderName", "FolderPath", "MasterDriveName", "MasterDriveID",
+    "RepVideoCount", "RepVideoFiles", "Container", "VideoCodec", "Width", "Height", "DurationSec",
+    "AspectRatio", "TVStandard", "AudioCodec", "AudioChannels", "AudioSampleRate",
+    "FileCount", "TotalSizeBytes", "TotalSizeHuman",
+    "ChecksumSHA1", "DuplicateOf",
+    "Setlist", "Notes", "LastScannedAt", "ExtractionWarnings"
+)
+# Written only with --tree-checksums, so default catalogs keep the header stages 04-11 expect
+TREE_FIELDNAMES = FIELDNAMES + ("ChecksumSHA1Tree",)
+_row_values = itemgetter(*FIELDNAMES)
+_SORT_COLS = tuple(FIELDNAMES.index(c) for c in ("Artist", "ShowDate", "FolderName"))
+# Rows per sorted run when the catalog is spooled to disk instead of held in memory
+SPOOL_RUN_ROWS = 10000
 
 # ===== Artist detection support =====
 BAND_NAMES = [
@@ -85,13 +141,33 @@ BAND_ALIASES = {
     "GNR": "Guns N' Roses"
 }
 
-_norm_punct = re.compile(r"[\s\-_.,:;!/\\]+")
-_norm_apos = re.compile(r"[’'`]")
+# Apostrophes are dropped and punctuation becomes a space; whitespace runs
+# are collapsed by split()/join, so they need no entry in the table.
+_norm_table = str.maketrans({**{c: " " for c in "-_.,:;!/\\"}, **{c: None for c in "’'`"}})
+
+
+def _compile_linear(pattern: str, ignorecase: bool = False):
+    """Compile with RE2 when installed, else re.
+
+    Only for patterns without \\b, \\d, \\s, \\w or lookarounds (spell classes out,
+    e.g. [0-9]): RE2 treats those as ASCII-only or rejects them, so such patterns
+    stay on re to keep matches identical.
+    """
+    if re2 is not None:
+        return re2.compile(("(?i)" if ignorecase else "") + pattern)
+    return re.compile(pattern, re.IGNORECASE if ignorecase else 0)
 
+
+def _normalize_text(s: str) -> str:
+    return " ".join(s.lower().translate(_norm_table).split())
+
+
+# Path segments (drive, artist parent) recur across every show in a library;
+# interned results make the _NAME_NORM_MAP lookups hit on identity first.
+# Notes text is unique per show, so it goes through _normalize_text uncached.
+@lru_cache(maxsize=4096)
 def _normalize_for_match(s: str) -> str:
-    s = _norm_apos.sub("", s.lower())
-    s = _norm_punct.sub(" ", s)
-    return " ".join(s.split())
+    return sys.intern(_normalize_text(s))
 
 
 def _compile_band_patterns(names: List[str]) -> List[Tuple[str, re.Pattern, str]]:
@@ -105,16 +181,47 @@ def _compile_band_patterns(names: List[str]) -> List[Tuple[str, re.Pattern, str]
     return prepared
 
 
+def _compile_search_set(names: List[str]) -> Dict[str, str]:
+    return { _normalize_for_match(n): n for n in names }
+
+
 _BAND_PATTERNS = _compile_band_patterns(BAND_NAMES + list(BAND_ALIASES.keys()))
+_NAME_NORM_MAP = _compile_search_set(BAND_NAMES)
+
+
+def _build_band_automaton(patterns: List[Tuple[str, re.Pattern, str]]):
+    """One automaton over every normalized name; payload rank preserves longest-first order."""
+    if ahocorasick is None:
+        return None
+    A = ahocorasick.Automaton()
+    for rank, (key, _, n_norm) in enumerate(patterns):
+        A.add_word(n_norm, (rank, key, len(n_norm)))
+    A.make_automaton()
+    return A
+
+
+_BAND_AUTOMATON = _build_band_automaton(_BAND_PATTERNS)
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
 
 DATE_PATTERNS = [
     r'\b(\d{4})[-/\.]([\d]{1,2})[-/\.]([\d]{1,2})\b',
     r'\b(\d{1,2})[-/\.]([\d]{1,2})[-/\.]([\d]{2,4})\b',
     r'\b([A-Za-z]{3,9})\s+(\d{1,2}),?\s+(\d{4})\b',
 ]
+_DATE_KINDS = ("ymd", "dmy", "mdy")
+# One scan for all formats. The alternation sits in a zero-width lookahead so hits
+# of different formats may overlap, and each format's first hit is exactly what a
+# separate re.search would return; DATE_PATTERNS order still decides priority.
+_DATE_RE = re.compile(
+    "(?=" + "|".join(f"(?P<{k}>{p})" for k, p in zip(_DATE_KINDS, DATE_PATTERNS)) + ")",
+    re.IGNORECASE | re.MULTILINE,
+)
 
 SETLIST_ANCHORS = re.compile(r'^(setlist|tracklist|tracks|songs)\s*:?\s*$', re.IGNORECASE)
-NON_SONG_HINTS = re.compile(r'(lineage|taper|venue|location|source|video|audio|menu|chapters|checksum|md5|author|www|http|https|torrent|poster)', re.IGNORECASE)
+NON_SONG_HINTS = _compile_linear(r'(lineage|taper|venue|location|source|video|audio|menu|chapters|checksum|md5|author|www|http|https|torrent|poster)', ignorecase=True)
 SONG_LINE = re.compile(
     r'^\s*(?:\d{1,2}\s*[.)-]\s*|\[\d{1,2}:\d{2}\]\s*|~?\d{1,2}:\d{2}\s*|-?\s*)?'
     r'([A-Za-z][A-Za-z0-9&/’\'()\-\. ]{2,})\s*$'
@@ -123,6 +230,26 @@ SONG_LINE = re.compile(
 VENUE_KEYS = re.compile(r'^(venue|place)\s*:?\s*$', re.IGNORECASE)
 LOCATION_KEYS = re.compile(r'^(location|city)\s*:?\s*$', re.IGNORECASE)
 COUNTRY_KEYS = re.compile(r'^(country)\s*:?\s*$', re.IGNORECASE)
+LINEAGE_KEYS = re.compile(r'^(lineage|source|taper|gen|generation)\s*:?\s*$', re.IGNORECASE)
+
+_RE_MULTISPACE = re.compile(r'\s{2,}')
+_RE_WS = re.compile(r'\s+')
+_RE_LINEAGE_INLINE = re.compile(r'^(lineage|source|taper|gen(?:eration)?)\s*[:\-]\s*(.+)$', re.IGNORECASE | re.MULTILINE)
+# DVD-Video file names are ASCII by spec, hence [0-9] and RE2
+_RE_VTS_KEY = _compile_linear(r'^(VTS_[0-9]{2})_[0-9]+\.VOB$', ignorecase=True)
+_RE_VTS_NUM = _compile_linear(r'_([0-9]+)\.VOB$', ignorecase=True)
+_RE_ALPHA = re.compile(r'[A-Za-z]')
+_RE_SONG_TIMESTAMP = re.compile(r'^\s*(?:\[\s*\d{1,2}:\d{2}\s*\]|\d{1,2}:\d{2})\s*[-–:]?\s*(.+)$')
+_RE_SONG_SUFFIX = re.compile(r'\s*\((live|cut|jam|tape|alt\.? mix|remix|reprise|acoustic|intro|outro)\)\s*$', re.IGNORECASE)
+
+_RE_PROSHOT = re.compile(r'(pro-?shot|broadcast|tv|multicam|soundboard|sbd|webcast|ppv|dvd\s*author)')
+_RE_AUDIENCE = re.compile(r'(audience|aud\b|taper|camcorder|handheld|hi8|minidv|\bvx\d{3,4}\b)')
+_RE_DOC = _compile_linear(r'(documentary|interview|featurette|behind the scenes|bts)')
+_RE_GEN_MASTER = re.compile(r'\b(master)\b')
+_RE_GEN_ORD = re.compile(r'\b(\d+)(st|nd|rd|th)\s*gen(eration)?\b')
+_RE_GEN_KW = re.compile(r'\bgen(?:eration)?\s*[:\- ]\s*(\d+)\b')
+_RE_SOURCE_EQUIP = re.compile(r'(mini\s*dv|minidv|hi8|betacam|vx\d{3,4}|xl1|xl2|hd pvr|hvr|sony|panasonic|canon)[^\n,;]*', re.IGNORECASE)
+_RE_WIDESCREEN = _compile_linear(r'(16:?9|widescreen)', ignorecase=True)
 
 INFO_DIR_HINTS = {"info", "nfo", "notes", "docs", "documentation", "about"}
 
@@ -134,63 +261,87 @@ US_STATE_ABBR = {
 }
 REGION_TO_COUNTRY = {
     **{st: "USA" for st in US_STATE_ABBR},
-    # Canada
+    # Canada (NT is also an Australian territory and resolves to Australia below)
     "AB":"Canada","BC":"Canada","MB":"Canada","NB":"Canada","NL":"Canada","NS":"Canada",
-    "NT":"Canada","NU":"Canada","ON":"Canada","PE":"Canada","QC":"Canada","SK":"Canada","YT":"Canada",
-    # Australia
+    "NU":"Canada","ON":"Canada","PE":"Canada","QC":"Canada","SK":"Canada","YT":"Canada",
+    # Australia (WA overrides the US state; NT overrides Canada)
     "NSW":"Australia","VIC":"Australia","QLD":"Australia","SA":"Australia","WA":"Australia","TAS":"Australia","ACT":"Australia","NT":"Australia",
     # UK regions (rare as abbreviations, but present for completeness)
     "ENG":"United Kingdom","SCT":"United Kingdom","WLS":"United Kingdom","NIR":"United Kingdom"
 }
-COUNTRY_NAMES = {
+COUNTRY_NAMES = frozenset({
     "United States","USA","US","United Kingdom","UK","England","Scotland","Wales",
     "Germany","France","Spain","Italy","Portugal","Netherlands","Belgium","Switzerland","Austria",
     "Brazil","Argentina","Chile","Mexico","Canada","Australia","New Zealand","Japan","South Korea",
     "Norway","Sweden","Denmark","Finland","Ireland","Poland","Czech Republic","Hungary","Greece",
     "Iceland","Luxembourg"
-}
+})
 _SEP = r"[,\-|–—]\s*"  # flexible separators
 
+# The _SEP characters as a translate table, so folder names split without regex;
+# its trailing \s* is covered by strip().
+# NUL cannot occur in a path component, so it is a safe split marker.
+_FOLDER_SEP_TABLE = str.maketrans(dict.fromkeys(",-|–—", "\x00"))
+_RE_COMMA = re.compile(r"\s*,\s*")
+_RE_CITY_REGION_SUFFIX = re.compile(r"(.+?)\s+([A-Z]{2,3})$")
+_RE_CITYREGION = re.compile(r"(.+?)\s*[-,]\s*([A-Za-z]{2,3})$")
+_RE_EVENT_DASH = re.compile(r"(.+?)\s+[–\-]\s+(.+)$")
+_RE_EVENT_CITYREGION = re.compile(r"(.+?)\s*[,–\-]\s*([A-Za-z]{2,3})$")
+_RE_EVENT_KEYWORDS = re.compile(r'(concert|festival|live|rockpalast|tour|show)', re.IGNORECASE)
+_RE_SPACED_DASH = re.compile(r'\s[–\-]\s')
+_RE_FESTIVAL = re.compile(r'\b(Festival|Rockpalast|Lollapalooza|Glastonbury|Reading|Leeds|Bonnaroo|Primavera|Big Day Out|Splendour in the Grass)\b', re.IGNORECASE)
+_RE_FOLDER_DATE_PREFIX = re.compile(r'\b\d{4}[-_]\d{2}[-_]\d{2}\b\s+(.+)')
+
+
+# Exact-case country names and uppercase region codes in one table, so the common
+# tokens resolve with a single lookup and .upper() is only paid on a miss
+_LOCATION_LOOKUP = {**REGION_TO_COUNTRY, **{c: c for c in COUNTRY_NAMES}}
+
+
+def _country_for(token: str) -> str:
+    """Country for a bare country name or region abbreviation, else ""."""
+    return _LOCATION_LOOKUP.get(token) or REGION_TO_COUNTRY.get(token.upper(), "")
+
+
+def _region_country(code: str) -> str:
+    """Country for a region abbreviation (any case), else ""."""
+    return REGION_TO_COUNTRY.get(code) or REGION_TO_COUNTRY.get(code.upper(), "")
+
 
 def now_iso() -> str:
     return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
 
-def run_cmd(cmd: str) -> str:
+def run_cmd_bytes(argv: Sequence[str]) -> bytes:
     try:
-        return subprocess.check_output(cmd, shell=True, stderr=subprocess.DEVNULL).decode("utf-8", errors="replace")
+        # Python's own fds are non-inheritable, so there is nothing for the child to close;
+        # close_fds=False also lets CPython spawn via posix_spawn/vfork instead of fork+exec
+        return subprocess.check_output(argv, stderr=subprocess.DEVNULL, close_fds=False)
     except Exception:
-        return ""
+        return b""
 
 
-def ffprobe_json(path: Path, header_only: bool) -> dict:
-    quoted = shlex.quote(str(path))
+def run_cmd(argv: List[str]) -> str:
+    return run_cmd_bytes(argv).decode("utf-8", errors="replace")
 
-    if header_only:
-        cmd = (
-            f'ffprobe -v quiet -print_format json -show_format -show_streams '
-            f'-read_intervals %+10 {quoted}'
-        )
-    else:
-        cmd = (
-            f'ffprobe -v quiet -print_format json -show_format -show_streams '
-            f'{quoted}'
-        )
 
-    out = run_cmd(cmd)
+_FFPROBE_ARGS_FULL = ("ffprobe", "-v", "quiet", "-print_format", "json", "-show_format", "-show_streams")
+_FFPROBE_ARGS_HEADER = _FFPROBE_ARGS_FULL + ("-read_intervals", "%+10")
+
+
+def ffprobe_json(path: Path, header_only: bool) -> dict:
+    argv = (_FFPROBE_ARGS_HEADER if header_only else _FFPROBE_ARGS_FULL) + (str(path),)
+    with _FFPROBE_SLOTS:
+        out = run_cmd_bytes(argv)
     if out.strip():
         try:
-            return json.loads(out)
+            return orjson.loads(out) if orjson is not None else json.loads(out)
         except Exception:
-            pass
-
-    ex = run_cmd(f'exiftool -json {quoted}')
-    try:
-        arr = json.loads(ex)
-        if isinstance(arr, list) and arr:
-            return {}
-    except Exception:
-        pass
+            # Tags that are not valid UTF-8: parse the leniently decoded text instead
+            try:
+                return json.loads(out.decode("utf-8", errors="replace"))
+            except Exception:
+                pass
     return {}
 
 
@@ -256,6 +407,14 @@ def parse_media_info(file_path: Path, header_only: bool) -> Dict[str, str]:
         return info
 
 
+def probe_segments(paths: List[Path], header_only: bool) -> List[Dict[str, str]]:
+    """parse_media_info for each path, in order, with up to FFPROBE_WORKERS probes in flight."""
+    if len(paths) <= 1 or FFPROBE_WORKERS <= 1:
+        return [parse_media_info(p, header_only) for p in paths]
+    with ThreadPoolExecutor(max_workers=min(len(paths), FFPROBE_WORKERS)) as ex:
+        return list(ex.map(lambda p: parse_media_info(p, header_only), paths))
+
+
 def human_size(num_bytes: int) -> str:
     step = 1024.0
     units = ["B", "KB", "MB", "GB", "TB", "PB"]
@@ -267,28 +426,43 @@ def human_size(num_bytes: int) -> str:
     return f"{s:.2f} EB"
 
 
+def _optional_module(name: str):
+    """Import an optional text-extraction package once; None if it is unavailable."""
+    if name not in _OPTIONAL_MODULES:
+        try:
+            _OPTIONAL_MODULES[name] = importlib.import_module(name)
+        except Exception:
+            _OPTIONAL_MODULES[name] = None
+    return _OPTIONAL_MODULES[name]
+
+
 def safe_read_text(path: Path) -> str:
     ext = path.suffix.lower()
     try:
         if ext in {".txt", ".nfo"}:
+            with open(path, "rb") as f:
+                data = f.read(MAX_NOTE_BYTES)
             try:
-                return path.read_text(encoding="utf-8")
-            except Exception:
-                return path.read_text(errors="replace")
-        if ext == ".docx" and 'Document' in globals() and Document is not None:
+                text = data.decode("utf-8")
+            except UnicodeDecodeError:
+                text = data.decode("utf-8", errors="replace")
+            # Same newline handling as opening in text mode
+            return text.replace("\r\n", "\n").replace("\r", "\n")
+        docx = _optional_module("docx") if ext == ".docx" else None
+        if docx is not None:
             try:
-                doc = Document(str(path))
+                doc = docx.Document(str(path))
                 return "\n".join(p.text for p in doc.paragraphs)
             except Exception:
                 return ""
         if ext in {".doc", ".rtf"} and platform.system().lower() == "darwin":
             try:
-                quoted = shlex.quote(str(path))
-                out = run_cmd(f'textutil -convert txt -stdout {quoted}')
+                out = run_cmd(["textutil", "-convert", "txt", "-stdout", str(path)])
                 return out if out else ""
             except Exception:
                 return ""
-        if textract and ext in {".doc", ".rtf"}:
+        textract = _optional_module("textract") if ext in {".doc", ".rtf"} else None
+        if textract is not None:
             try:
                 return textract.process(str(path)).decode("utf-8", errors="replace")
             except Exception:
@@ -298,16 +472,43 @@ def safe_read_text(path: Path) -> str:
     return ""
 
 
+@lru_cache(maxsize=8192)
+def _scandir(dirpath: str) -> Tuple[os.DirEntry, ...]:
+    """
+    Memoized scandir listing, shared by the show test, note discovery and the tree
+    summary so each directory is read once per scan. DirEntry caches its own stat,
+    so a file stat'ed by one of them is free for the others. Errors are not cached.
+    """
+    with os.scandir(dirpath) as it:
+        return tuple(it)
+
+
+def _iter_note_files(dirpath: str, rel: Tuple[str, ...] = ()):
+    """
+    Yield (relative dir parts, path) for note files below dirpath.
+    Same reach as rglob (no descent into symlinked dirs) but filters by
+    extension on the entry name, so media files are never stat'ed.
+    """
+    try:
+        entries = _scandir(dirpath)
+    except OSError:
+        return
+    for e in entries:
+        try:
+            if e.is_dir(follow_symlinks=False):
+                yield from _iter_note_files(e.path, rel + (e.name,))
+            elif os.path.splitext(e.name)[1].lower() in TEXT_EXTS and e.is_file():
+                yield rel, e.path
+        except OSError:
+            continue
+
+
 def collect_notes(folder: Path, warnings: List[str]) -> str:
     texts = []
     try:
-        for p in folder.rglob("*"):
-            if not p.is_file():
-                continue
-            if p.suffix.lower() in TEXT_EXTS:
-                parts = [seg.lower() for seg in p.relative_to(folder).parts[:-1]]
-                score = 1 if any(seg in INFO_DIR_HINTS for seg in parts) else 0
-                texts.append((score, p))
+        for rel, p in _iter_note_files(str(folder)):
+            score = 1 if any(seg.lower() in INFO_DIR_HINTS for seg in rel) else 0
+            texts.append((score, Path(p)))
         texts.sort(key=lambda t: (-t[0], str(t[1])))
         chunks = []
         seen_paths = set()
@@ -329,29 +530,35 @@ def collect_notes(folder: Path, warnings: List[str]) -> str:
 def guess_date(text: str) -> str:
     if not text:
         return ""
-    for pat in DATE_PATTERNS:
-        m = re.search(pat, text, flags=re.IGNORECASE | re.MULTILINE)
-        if m:
-            try:
-                if len(m.groups()) == 3:
-                    g = m.groups()
-                    if pat.startswith(r'\b(\d{4})'):
-                        y, mo, d = int(g[0]), int(g[1]), int(g[2])
-                    elif pat.startswith(r'\b(\d{1,2})'):
-                        a, b, c = int(g[0]), int(g[1]), int(g[2])
-                        if c < 100:
-                            c += 2000
-                        if a > 12:
-                            d, mo, y = a, b, c
-                        else:
-                            mo, d, y = a, b, c
-                    else:
-                        from datetime import datetime as _dt
-                        mon, d, y = g[0], int(g[1]), int(g[2])
-                        mo = _dt.strptime(mon[:3], "%b").month
-                    return f"{y:04d}-{mo:02d}-{d:02d}"
-            except Exception:
-                continue
+    first: Dict[str, re.Match] = {}
+    for m in _DATE_RE.finditer(text):
+        if m.lastgroup not in first:
+            first[m.lastgroup] = m
+            if m.lastgroup == "ymd":
+                break
+    for kind in _DATE_KINDS:
+        m = first.get(kind)
+        if not m:
+            continue
+        i = _DATE_RE.groupindex[kind]
+        g = m.group(i + 1, i + 2, i + 3)
+        try:
+            if kind == "ymd":
+                y, mo, d = int(g[0]), int(g[1]), int(g[2])
+            elif kind == "dmy":
+                a, b, c = int(g[0]), int(g[1]), int(g[2])
+                if c < 100:
+                    c += 2000
+                if a > 12:
+                    d, mo, y = a, b, c
+                else:
+                    mo, d, y = a, b, c
+            else:
+                mon, d, y = g[0], int(g[1]), int(g[2])
+                mo = datetime.strptime(mon[:3], "%b").month
+            return f"{y:04d}-{mo:02d}-{d:02d}"
+        except Exception:
+            continue
     return ""
 
 
@@ -379,22 +586,24 @@ def clean_song_title(line: str) -> Optional[str]:
     if not line:
         return None
     raw = line.strip()
-    m_ts = re.match(r'^\s*(?:\[\s*\d{1,2}:\d{2}\s*\]|\d{1,2}:\d{2})\s*[-–:]?\s*(.+)$', raw)
+    if not raw:
+        return None
+    # A timestamp prefix can only start with "[" or a digit; skip the regex otherwise
+    m_ts = _RE_SONG_TIMESTAMP.match(raw) if raw[0] == "[" or raw[0].isdigit() else None
     if m_ts:
         title = m_ts.group(1).strip()
-        title = re.sub(r'\s{2,}', ' ', title).strip(' .-')
-        if len(re.findall(r'[A-Za-z]', title)) >= 2:
+        title = _RE_MULTISPACE.sub(' ', title).strip(' .-')
+        if len(_RE_ALPHA.findall(title)) >= 2:
             return title
         return None
-    if NON_SONG_HINTS.search(raw):
-        return None
+    # Anchored SONG_LINE rejects most lines cheaply; only then scan for non-song hints
     m = SONG_LINE.match(raw)
-    if not m:
+    if not m or NON_SONG_HINTS.search(raw):
         return None
     title = m.group(1).strip()
-    title = re.sub(r'\s*\((live|cut|jam|tape|alt\.? mix|remix|reprise|acoustic|intro|outro)\)\s*$', '', title, flags=re.IGNORECASE)
-    title = re.sub(r'\s{2,}', ' ', title).strip(' .-')
-    if len(re.findall(r'[A-Za-z]', title)) < 2:
+    title = _RE_SONG_SUFFIX.sub('', title)
+    title = _RE_MULTISPACE.sub(' ', title).strip(' .-')
+    if len(_RE_ALPHA.findall(title)) < 2:
         return None
     return title
 
@@ -407,9 +616,12 @@ def extract_setlist(notes: str) -> str:
     titles, seen = [], set()
     for ln in candidates:
         t = clean_song_title(ln)
-        if t and t.lower() not in seen:
+        if not t:
+            continue
+        key = t.lower()
+        if key not in seen:
             titles.append(t)
-            seen.add(t.lower())
+            seen.add(key)
     return "; ".join(titles[:200])
 
 
@@ -446,23 +658,24 @@ def parse_location(notes: str, folder_name: str) -> Tuple[str, str, str, str, st
         return venue, city, country, festival, hint
 
     lines = [ln.strip() for ln in notes.splitlines() if ln.strip()]
-    lines = [re.sub(r"\s{2,}", " ", ln) for ln in lines]
+    lines = [_RE_MULTISPACE.sub(" ", ln) for ln in lines]
 
-    # 1) Single-line comma-separated: Venue, City[, Region], Country
-    for ln in lines:
-        parts = [p.strip() for p in re.split(r"\s*,\s*", ln) if p.strip()]
+    # Single pass over the lines. Rule 1 wins outright on its first hit; rules 2-4
+    # only remember their first hit and are resolved in priority order afterwards.
+    stack_hit = event_hit = cityregion_hit = None
+    prev_event = None
+    for i, ln in enumerate(lines):
+        parts = [p.strip() for p in _RE_COMMA.split(ln) if p.strip()]
+
+        # 1) Single-line comma-separated: Venue, City[, Region], Country
         if len(parts) >= 2:
-            last = parts[-1]
-            last_up = last.upper()
-            if last in COUNTRY_NAMES or last_up in REGION_TO_COUNTRY:
-                country = last if last in COUNTRY_NAMES else REGION_TO_COUNTRY[last_up]
+            country = _country_for(parts[-1])
+            if country:
                 if len(parts) >= 3:
                     mid = parts[-2]
-                    m = re.match(r"(.+?)\s+([A-Z]{2,3})$", mid)
-                    if m and m.group(2).upper() in REGION_TO_COUNTRY:
+                    m = _RE_CITY_REGION_SUFFIX.match(mid)
+                    if m and _region_country(m.group(2)):
                         city = m.group(1).strip()
-                        if not country:
-                            country = REGION_TO_COUNTRY[m.group(2).upper()]
                     else:
                         city = mid.strip()
                     venue = ", ".join(parts[:-2]).strip() if len(parts) > 2 else ""
@@ -471,63 +684,37 @@ def parse_location(notes: str, folder_name: str) -> Tuple[str, str, str, str, st
                     venue = ""
                 return venue, city, country, festival, "loc:comma"
 
-    # 2) Three-line stack: Venue / City[-|, Region] / Country
-    for i in range(len(lines) - 2):
-        a, b, c = lines[i], lines[i + 1], lines[i + 2]
-        c_up = c.upper()
-        if c in COUNTRY_NAMES or c_up in REGION_TO_COUNTRY:
-            b_city = b
-            b_country = ""
-            m = re.match(r"(.+?)\s*[-,]\s*([A-Za-z]{2,3})$", b)
-            if m and m.group(2).upper() in REGION_TO_COUNTRY:
-                b_city = m.group(1).strip()
-                b_country = REGION_TO_COUNTRY[m.group(2).upper()]
-            venue = a
-            city = b_city
-            country = c if c in COUNTRY_NAMES else REGION_TO_COUNTRY[c_up]
-            if b_country and not country:
-                country = b_country
-            return venue, city, country, festival, "loc:stack"
-
-    # 3) Event - Venue on one line; next line City[, Region/Country]
-    for i in range(len(lines) - 1):
-        m = re.match(r"(.+?)\s+[–\-]\s+(.+)$", lines[i])
-        if m:
-            ev, ven = m.group(1).strip(), m.group(2).strip()
-            nxt = lines[i + 1]
-            m2 = re.match(r"(.+?)\s*[,–\-]\s*([A-Za-z]{2,3})$", nxt)
-            if m2 and m2.group(2).upper() in REGION_TO_COUNTRY:
-                city = m2.group(1).strip()
-                country = REGION_TO_COUNTRY[m2.group(2).upper()]
-                venue = ven
-                festival = ev
-                return venue, city, country, festival, "loc:eventline"
-            parts = [p.strip() for p in re.split(r"\s*,\s*", nxt) if p.strip()]
-            if len(parts) == 2:
-                pr2 = parts[1]
-                pr2_up = pr2.upper()
-                if pr2 in COUNTRY_NAMES or pr2_up in REGION_TO_COUNTRY:
-                    city = parts[0]
-                    country = pr2 if pr2 in COUNTRY_NAMES else REGION_TO_COUNTRY[pr2_up]
-                    venue = ven
-                    festival = ev
-                    return venue, city, country, festival, "loc:eventline"
+        # 2) Three-line stack: Venue / City[-|, Region] / Country
+        if stack_hit is None and i >= 2:
+            c_country = _country_for(ln)
+            if c_country:
+                b_city = lines[i - 1]
+                m = _RE_CITYREGION.match(b_city)
+                if m and _region_country(m.group(2)):
+                    b_city = m.group(1).strip()
+                stack_hit = (lines[i - 2], b_city, c_country, festival, "loc:stack")
+
+        # 3) Event - Venue on the previous line; this line City[, Region]
+        if event_hit is None and prev_event:
+            m2 = _RE_EVENT_CITYREGION.match(ln)
+            m2_country = _region_country(m2.group(2)) if m2 else ""
+            if m2_country:
+                event_hit = (
+                    prev_event.group(2).strip(), m2.group(1).strip(),
+                    m2_country, prev_event.group(1).strip(), "loc:eventline"
+                )
+        prev_event = _RE_EVENT_DASH.match(ln) if event_hit is None else None
 
-    # 4) City - Region or City, Country alone
-    for ln in lines:
-        m = re.match(r"(.+?)\s*[-,]\s*([A-Za-z]{2,3})$", ln)
-        if m and m.group(2).upper() in REGION_TO_COUNTRY:
-            city = m.group(1).strip()
-            country = REGION_TO_COUNTRY[m.group(2).upper()]
-            return venue, city, country, festival, "loc:cityregion"
-        parts = [p.strip() for p in re.split(r"\s*,\s*", ln) if p.strip()]
-        if len(parts) == 2:
-            pr2 = parts[1]
-            pr2_up = pr2.upper()
-            if pr2 in COUNTRY_NAMES or pr2_up in REGION_TO_COUNTRY:
-                city = parts[0]
-                country = pr2 if pr2 in COUNTRY_NAMES else REGION_TO_COUNTRY[pr2_up]
-                return venue, city, country, festival, "loc:citycountry"
+        # 4) City - Region alone
+        if cityregion_hit is None:
+            m = _RE_CITYREGION.match(ln)
+            m_country = _region_country(m.group(2)) if m else ""
+            if m_country:
+                cityregion_hit = (venue, m.group(1).strip(), m_country, festival, "loc:cityregion")
+
+    for hit in (stack_hit, event_hit, cityregion_hit):
+        if hit:
+            return hit
 
     # 5) Folder-name fallback
     venue, city, country, hint = _folder_name_loc_fallback(folder_name)
@@ -536,7 +723,7 @@ def parse_location(notes: str, folder_name: str) -> Tuple[str, str, str, str, st
 
     # 6) Festival keyword fallback
     if not festival and notes:
-        m = re.search(r'\b(Festival|Rockpalast|Lollapalooza|Glastonbury|Reading|Leeds|Bonnaroo|Primavera|Big Day Out|Splendour in the Grass)\b', notes, re.IGNORECASE)
+        m = _RE_FESTIVAL.search(notes)
         if m:
             festival = m.group(1)
     return venue, city, country, festival, ""
@@ -545,9 +732,9 @@ def parse_location(notes: str, folder_name: str) -> Tuple[str, str, str, str, st
 def _folder_name_loc_fallback(folder_name: str) -> Tuple[str, str, str, str]:
     """Infer location from folder name patterns. Returns (venue, city, country, hint)."""
     venue, city, country, hint = "", "", "", ""
-    m = re.search(r'\b\d{4}[-_]\d{2}[-_]\d{2}\b\s+(.+)', folder_name)
+    m = _RE_FOLDER_DATE_PREFIX.search(folder_name)
     cand = m.group(1).strip() if m else folder_name
-    parts = [p.strip() for p in re.split(_SEP, cand) if p.strip()]
+    parts = [p for p in (p.strip() for p in cand.translate(_FOLDER_SEP_TABLE).split("\x00")) if p]
     if len(parts) >= 3:
         venue, city, country = parts[0], parts[1], parts[2]
         hint = "loc:folder"
@@ -570,8 +757,8 @@ def extract_event_and_split_venue(notes: str, existing_venue: str) -> Tuple[str,
         ln = ln.strip()
         if not ln:
             continue
-        if re.search(r'(concert|festival|live|rockpalast|tour|show)', ln, re.IGNORECASE) and re.search(r'\s[–\-]\s', ln):
-            m = re.match(r'(.+?)\s+[–\-]\s+(.+)$', ln)
+        if _RE_EVENT_KEYWORDS.search(ln) and _RE_SPACED_DASH.search(ln):
+            m = _RE_EVENT_DASH.match(ln)
             if m:
                 event = m.group(1).strip()
                 ven = m.group(2).strip()
@@ -579,27 +766,34 @@ def extract_event_and_split_venue(notes: str, existing_venue: str) -> Tuple[str,
     return "", "", ""
 
 
-def _compile_search_set(names: List[str]) -> Dict[str, str]:
-    return { _normalize_for_match(n): n for n in names }
-
-
 def resolve_artist(folder: Path, notes: str) -> str:
     # 1) Exact segment match against canonical names
-    segments = [p for p in folder.resolve().parts if p and p != os.sep]
+    segments = [p for p in _resolved(folder).parts if p and p != os.sep]
     seg_norm_map = {seg: _normalize_for_match(seg) for seg in segments}
-    name_norm_map = _compile_search_set(BAND_NAMES)
     for seg, seg_norm in seg_norm_map.items():
-        if seg_norm in name_norm_map:
-            return name_norm_map[seg_norm]
+        if seg_norm in _NAME_NORM_MAP:
+            return _NAME_NORM_MAP[seg_norm]
 
     # Patterns support partial matches and aliases
     folder_norm = _normalize_for_match(folder.name)
     parent_norm = _normalize_for_match(folder.parent.name) if folder.parent else ""
-    notes_norm = _normalize_for_match(notes or "")
+    notes_norm = _normalize_text(notes or "")
 
     def search_longest(hay: str) -> Optional[str]:
         if not hay:
             return None
+        if _BAND_AUTOMATON is not None:
+            # Same semantics as the regex scan: word-bounded hits, longest name wins
+            best = None
+            for end, (rank, key, n) in _BAND_AUTOMATON.iter(hay):
+                start = end - n + 1
+                if start > 0 and _is_word_char(hay[start - 1]):
+                    continue
+                if end + 1 < len(hay) and _is_word_char(hay[end + 1]):
+                    continue
+                if best is None or rank < best[0]:
+                    best = (rank, key)
+            return BAND_ALIASES.get(best[1], best[1]) if best else None
         for key, pat, _ in _BAND_PATTERNS:
             if pat.search(hay):
                 return BAND_ALIASES.get(key, key)
@@ -615,18 +809,50 @@ def resolve_artist(folder: Path, notes: str) -> str:
     return folder.name
 
 
-def master_drive_name_for(folder: Path, roots: List[Path]) -> Path:
-    f = str(folder.resolve())
+@lru_cache(maxsize=4096)
+def _resolved(folder: Path) -> Path:
+    """folder.resolve(), once per folder: the row build needs it for artist, drive and FolderPath."""
+    return folder.resolve()
+
+
+def resolve_roots(roots: List[Path]) -> List[Tuple[str, Path]]:
+    """(resolved path string, root) pairs, longest root first, for master_drive_name_for."""
+    return [(str(r.resolve()), r) for r in sorted(roots, key=lambda p: len(str(p)), reverse=True)]
+
+
+def master_drive_name_for(folder: Path, resolved_roots: List[Tuple[str, Path]]) -> Path:
+    f = str(_resolved(folder))
     chosen = None
-    for r in sorted(roots, key=lambda p: len(str(p)), reverse=True):
-        rp = str(r.resolve())
+    for rp, r in resolved_roots:
         if f.startswith(rp):
             chosen = r
             break
     return chosen if chosen else Path("")
 
 
+@lru_cache(maxsize=None)
+def _fallback_drive_id(root: Path) -> str:
+    # Existing catalogs already carry these ids, so the digest must stay SHA1
+    return hashlib.sha1(str(root.resolve()).encode("utf-8")).hexdigest()[:12]
+
+
+# Drive lookups the parent already made, handed to process workers by _init_process_worker
+_SEEDED_DRIVES: Dict[Path, Tuple[str, str]] = {}
+
+
+def _init_process_worker(drives: Dict[Path, Tuple[str, str]], ffprobe_slots: int) -> None:
+    """Pool initializer: spawn/forkserver workers start with an empty lru_cache, and every
+    worker would otherwise allow FFPROBE_MAX_IN_FLIGHT ffprobes of its own."""
+    global _FFPROBE_SLOTS
+    _SEEDED_DRIVES.update(drives)
+    _FFPROBE_SLOTS = threading.BoundedSemaphore(ffprobe_slots)
+
+
+@lru_cache(maxsize=64)
 def master_drive_label_and_id(root: Path) -> Tuple[str, str]:
+    """(label, id) of the drive holding root. Memoized: each row asks for its scan root."""
+    if root in _SEEDED_DRIVES:
+        return _SEEDED_DRIVES[root]
     label = ""
     devid = ""
     try:
@@ -635,17 +861,18 @@ def master_drive_label_and_id(root: Path) -> Tuple[str, str]:
             parts = root.resolve().parts
             if len(parts) >= 3 and parts[1] == "Volumes":
                 label = parts[2]
-                out = run_cmd(f'diskutil info -plist {shlex.quote(str(root))}')
+                out = run_cmd(["diskutil", "info", "-plist", str(root)])
                 m = re.search(r'<key>VolumeUUID</key>\s*<string>([^<]+)</string>', out)
                 if m:
                     devid = m.group(1)
         elif sysname == "windows":
             drv = os.path.splitdrive(str(root))[0]
             if drv:
-                out = run_cmd(
-                    f'powershell -NoProfile -Command "Get-Volume -DriveLetter {drv[0]} | '
-                    f'Format-List -Property DriveLetter,FileSystemLabel,UniqueId,SerialNumber"'
-                )
+                out = run_cmd([
+                    "powershell", "-NoProfile", "-Command",
+                    f"Get-Volume -DriveLetter {drv[0]} | "
+                    f"Format-List -Property DriveLetter,FileSystemLabel,UniqueId,SerialNumber"
+                ])
                 mlabel = re.search(r'FileSystemLabel\s*:\s*(.+)', out)
                 mid = re.search(r'UniqueId\s*:\s*(.+)', out) or re.search(r'SerialNumber\s*:\s*(.+)', out)
                 if mlabel:
@@ -661,45 +888,51 @@ def master_drive_label_and_id(root: Path) -> Tuple[str, str]:
     except Exception:
         pass
     if not devid:
-        devid = hashlib.sha1(str(root.resolve()).encode("utf-8")).hexdigest()[:12]
+        devid = _fallback_drive_id(root)
     if not label:
         label = root.name or str(root)
     return label, devid
 
 
-def _video_ts_present(dirpath: Path) -> bool:
-    """Case-insensitive VIDEO_TS detection with case-insensitive .VOB check."""
-    try:
-        for child in dirpath.iterdir():
-            if child.is_dir() and child.name.lower() == "video_ts":
-                for f in child.iterdir():
-                    if f.is_file() and f.suffix.lower() == ".vob":
-                        return True
-    except Exception:
-        return False
-    return False
-
-
-def _has_direct_video_files(dirpath: Path) -> bool:
+@lru_cache(maxsize=8192)
+def _dir_has_vob(dirpath: str) -> bool:
+    """Case-insensitive .VOB check inside an already-located VIDEO_TS folder."""
     try:
-        for p in dirpath.iterdir():
-            if p.is_file() and p.suffix.lower() in VIDEO_EXTS:
+        for f in _scandir(dirpath):
+            if os.path.splitext(f.name)[1].lower() == ".vob" and f.is_file():
                 return True
     except Exception:
         return False
     return False
 
 
-def _child_looks_like_show(child: Path) -> bool:
-    if _video_ts_present(child):
-        return True
+@lru_cache(maxsize=8192)
+def _dir_summary(dirpath: str) -> Tuple[bool, Tuple[str, ...], Tuple[str, ...]]:
+    """
+    One scandir of dirpath: (has a direct video file, VIDEO_TS dirs, child dirs).
+    Memoized per scan, as a folder is listed once as its parent's child and again
+    when os.walk reaches it.
+    """
+    has_direct_video = False
+    vts_dirs: List[str] = []
+    child_dirs: List[str] = []
+    for e in _scandir(dirpath):
+        if e.is_dir():
+            child_dirs.append(e.path)
+            if e.name.lower() == "video_ts":
+                vts_dirs.append(e.path)
+        elif not has_direct_video and os.path.splitext(e.name)[1].lower() in VIDEO_EXTS and e.is_file():
+            has_direct_video = True
+    return has_direct_video, tuple(vts_dirs), tuple(child_dirs)
+
+
+def _child_looks_like_show(child: str) -> bool:
+    """A direct video file, else any VIDEO_TS with a .VOB."""
     try:
-        for p in child.iterdir():
-            if p.is_file() and p.suffix.lower() in VIDEO_EXTS:
-                return True
+        has_direct_video, vts_dirs, _ = _dir_summary(child)
+        return has_direct_video or any(_dir_has_vob(v) for v in vts_dirs)
     except Exception:
         return False
-    return False
 
 
 def is_show_folder(folder: Path) -> bool:
@@ -711,40 +944,43 @@ def is_show_folder(folder: Path) -> bool:
     do NOT count the parent as a show.
     """
     try:
-        if _video_ts_present(folder):
+        has_direct_video, vts_dirs, child_dirs = _dir_summary(str(folder))
+        if any(_dir_has_vob(v) for v in vts_dirs):
             return True
-        direct_video = _has_direct_video_files(folder)
+        if not has_direct_video:
+            # Child shows can only veto a direct-video folder, so skip looking at them
+            return False
         child_show_dirs = 0
-        for child in folder.iterdir():
-            if child.is_dir() and _child_looks_like_show(child):
+        for child in child_dirs:
+            if _child_looks_like_show(child):
                 child_show_dirs += 1
                 if child_show_dirs >= 2:
                     return False
-        return bool(direct_video)
+        return True
     except Exception:
         return False
 
 
 def determine_recording_type(notes: str, folder: Path) -> str:
     text = f"{notes}\n{folder.name}".lower()
-    if re.search(r'(pro-?shot|broadcast|tv|multicam|soundboard|sbd|webcast|ppv|dvd\s*author)', text):
+    if _RE_PROSHOT.search(text):
         return "Proshot"
-    if re.search(r'(audience|aud\b|taper|camcorder|handheld|hi8|minidv|\bvx\d{3,4}\b)', text):
+    if _RE_AUDIENCE.search(text):
         return "Audience"
-    if re.search(r'(documentary|interview|featurette|behind the scenes|bts)', text):
+    if _RE_DOC.search(text):
         return "Documentary"
     return ""
 
 
 def determine_generation(notes: str, folder: Path) -> str:
     text = f"{notes}\n{folder.name}".lower()
-    m = re.search(r'\b(master)\b', text)
+    m = _RE_GEN_MASTER.search(text)
     if m:
         return "Master"
-    m = re.search(r'\b(\d+)(st|nd|rd|th)\s*gen(eration)?\b', text)
+    m = _RE_GEN_ORD.search(text)
     if m:
         return f"{m.group(1)}{m.group(2)} Gen"
-    m = re.search(r'\bgen(?:eration)?\s*[:\- ]\s*(\d+)\b', text)
+    m = _RE_GEN_KW.search(text)
     if m:
         return f"{m.group(1)} Gen"
     return ""
@@ -753,16 +989,21 @@ def determine_generation(notes: str, folder: Path) -> str:
 def extract_source_equipment(lineage: str) -> str:
     if not lineage:
         return ""
-    m = re.search(r'(mini\s*dv|minidv|hi8|betacam|vx\d{3,4}|xl1|xl2|hd pvr|hvr|sony|panasonic|canon)[^\n,;]*', lineage, re.IGNORECASE)
+    m = _RE_SOURCE_EQUIP.search(lineage)
     return m.group(0).strip() if m else ""
 
 
+def _mentions_widescreen(notes: str, foldername: str) -> bool:
+    # No match can span the joining space, so searching each part avoids copying the notes
+    return bool(_RE_WIDESCREEN.search(notes) or _RE_WIDESCREEN.search(foldername))
+
+
 def derive_aspect_ratio(width: str, height: str, dar: str, sar: str, codec: str, notes: str, foldername: str) -> str:
     if dar in {"16:9", "1.78:1", "1.7778"}:
         return "16:9 (native)"
     if dar in {"4:3", "1.33:1", "1.3333"}:
         if codec.lower() == "mpeg2video":
-            if re.search(r'(16:?9|widescreen)', f"{notes} {foldername}", re.IGNORECASE):
+            if _mentions_widescreen(notes, foldername):
                 return "4:3 (letterboxed 16:9)"
         return "4:3 (native)"
     try:
@@ -773,7 +1014,7 @@ def derive_aspect_ratio(width: str, height: str, dar: str, sar: str, codec: str,
             if abs(ratio - 16 / 9) < 0.05:
                 return "16:9 (native)"
             if abs(ratio - 4 / 3) < 0.05:
-                if codec.lower() == "mpeg2video" and re.search(r'(16:?9|widescreen)', f"{notes} {foldername}", re.IGNORECASE):
+                if codec.lower() == "mpeg2video" and _mentions_widescreen(notes, foldername):
                     return "4:3 (letterboxed 16:9)"
                 return "4:3 (native)"
     except Exception:
@@ -781,6 +1022,7 @@ def derive_aspect_ratio(width: str, height: str, dar: str, sar: str, codec: str,
     return ""
 
 
+@lru_cache(maxsize=256)
 def derive_tv_standard(fps_str: str) -> str:
     try:
         fps = float(fps_str)
@@ -793,37 +1035,152 @@ def derive_tv_standard(fps_str: str) -> str:
     return ""
 
 
-def sha1_of_files_in_order(paths: List[Path]) -> str:
+def _hash_mapped(hashes, f) -> bool:
+    """
+    Hash a large file straight from the page cache in MMAP_HASH_SLICE steps; kernel
+    readahead (MADV_SEQUENTIAL) keeps the disk busy meanwhile. False if it can't map.
+    """
+    try:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return False
+    with mm:
+        if hasattr(mm, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+            mm.madvise(mmap.MADV_SEQUENTIAL)
+        with memoryview(mm) as view:
+            for off in range(0, len(mm), MMAP_HASH_SLICE):
+                with view[off:off + MMAP_HASH_SLICE] as chunk:
+                    for h in hashes:
+                        h.update(chunk)
+    return True
+
+
+def _hash_file_into(hashes, path: Path, bufs: Tuple[bytearray, bytearray], reader: ThreadPoolExecutor):
+    """
+    Double-buffered read: the next chunk is read on the helper thread while the
+    current one is fed to every hasher. Both release the GIL, so disk and SHA1 overlap.
+    """
+    with open(path, "rb", buffering=0) as f:
+        if os.fstat(f.fileno()).st_size > MMAP_HASH_MIN and _hash_mapped(hashes, f):
+            return
+        if hasattr(os, "posix_fadvise"):
+            try:
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            except OSError:
+                pass
+        i = 0
+        n = f.readinto(bufs[0])
+        while n:
+            pending = reader.submit(f.readinto, bufs[1 - i])
+            chunk = memoryview(bufs[i])[:n]
+            for h in hashes:
+                h.update(chunk)
+            n = pending.result()
+            i = 1 - i
+
+
+def _hash_files_in_order(paths: List[Path], tree: bool) -> Tuple[str, str]:
     h = hashlib.sha1()
+    digests = []
     bufsize = 1024 * 1024
-    for p in paths:
-        try:
-            with open(p, "rb") as f:
-                while True:
-                    b = f.read(bufsize)
-                    if not b:
-                        break
-                    h.update(b)
-        except Exception:
-            return ""
-    return h.hexdigest()
+    bufs = (bytearray(bufsize), bytearray(bufsize))
+    with ThreadPoolExecutor(max_workers=1) as reader:
+        for p in paths:
+            per_file = hashlib.sha1() if tree else None
+            try:
+                _hash_file_into((h, per_file) if tree else (h,), p, bufs, reader)
+            except Exception:
+                return "", ""
+            if tree:
+                digests.append(per_file.digest())
+    return h.hexdigest(), (hashlib.sha1(b"".join(digests)).hexdigest() if tree else "")
+
+
+def sha1_of_files_in_order(paths: List[Path]) -> str:
+    return _hash_files_in_order(paths, tree=False)[0]
+
+
+def sha1_and_tree_of_files(paths: List[Path]) -> Tuple[str, str]:
+    """
+    ChecksumSHA1 plus ChecksumSHA1Tree (SHA1 over the per-file SHA1 digests, in path
+    order) from one read of each file: every chunk feeds both hashers.
+    """
+    return _hash_files_in_order(paths, tree=True)
+
+
+_CHECKSUM_DB_LOCAL = threading.local()
+
+
+def init_checksum_cache(db_path: str):
+    """Create the sidecar once, before workers open it; WAL lets them read and write concurrently."""
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS checksums ("
+            " folder TEXT NOT NULL, kind TEXT NOT NULL, files TEXT NOT NULL,"
+            " total_bytes INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, checksum TEXT NOT NULL,"
+            " PRIMARY KEY (folder, kind))"
+        )
+    conn.close()
+
+
+def _checksum_db(db_path: str) -> sqlite3.Connection:
+    """One connection per worker thread (sqlite3 connections can't cross threads)."""
+    conns = getattr(_CHECKSUM_DB_LOCAL, "conns", None)
+    if conns is None:
+        conns = _CHECKSUM_DB_LOCAL.conns = {}
+    if db_path not in conns:
+        conns[db_path] = sqlite3.connect(db_path, timeout=30)
+    return conns[db_path]
+
+
+def cached_checksums(db_path: Optional[str], folder: str, kinds: Tuple[str, ...], rep_files: List[Path], total_bytes: int, compute) -> Tuple[str, ...]:
+    """
+    compute(rep_files), one checksum per kind, reusing the sidecar values while the
+    folder's representative files, total size and newest mtime are unchanged, so
+    rescans skip rehashing. A kind missing from the sidecar recomputes them all.
+    """
+    if not db_path:
+        return compute(rep_files)
+    try:
+        files = "; ".join(str(p) for p in rep_files)
+        mtime_ns = max(os.stat(p).st_mtime_ns for p in rep_files)
+        conn = _checksum_db(db_path)
+        hits = dict(conn.execute(
+            "SELECT kind, checksum FROM checksums WHERE folder=? AND files=? AND total_bytes=? AND mtime_ns=?",
+            (folder, files, total_bytes, mtime_ns),
+        ).fetchall())
+    except Exception:
+        return compute(rep_files)
+    if all(k in hits for k in kinds):
+        return tuple(hits[k] for k in kinds)
+    checksums = compute(rep_files)
+    try:
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO checksums VALUES (?, ?, ?, ?, ?, ?)",
+                [(folder, k, files, total_bytes, mtime_ns, c) for k, c in zip(kinds, checksums) if c],
+            )
+    except Exception:
+        pass
+    return checksums
 
 
 def extract_lineage(notes: str) -> str:
     if not notes:
         return ""
-    inline = re.findall(r'(?im)^(lineage|source|taper|gen(?:eration)?)\s*[:\-]\s*(.+)$', notes)
+    inline = _RE_LINEAGE_INLINE.findall(notes)
     pieces = [p[1].strip() for p in inline if p[1].strip()]
 
     if not pieces:
-        anchored = extract_section_by_anchor(notes, re.compile(r'^(lineage|source|taper|gen|generation)\s*:?\s*$', re.IGNORECASE))
+        anchored = extract_section_by_anchor(notes, LINEAGE_KEYS)
         if anchored:
-            pieces = [re.sub(r'\s+', ' ', x).strip() for x in anchored if x.strip()]
+            pieces = [_RE_WS.sub(' ', x).strip() for x in anchored if x.strip()]
 
     if not pieces:
-        line = first_line_after_key(notes, [re.compile(r'^(lineage|source|taper|gen|generation)\s*:?\s*$', re.IGNORECASE)])
+        line = first_line_after_key(notes, [LINEAGE_KEYS])
         if line:
-            pieces = [re.sub(r'\s+', ' ', line).strip()]
+            pieces = [_RE_WS.sub(' ', line).strip()]
 
     seen = set()
     out = []
@@ -835,25 +1192,71 @@ def extract_lineage(notes: str) -> str:
     return " | ".join(out)[:2000]
 
 
+def _walk_entries(root: str):
+    """
+    Yield every DirEntry below root in rglob("*") order: a directory's entries,
+    then each of its subdirectories in turn. Symlinked dirs are yielded but,
+    as with rglob, not descended into.
+    """
+    stack = [root]
+    while stack:
+        try:
+            entries = _scandir(stack.pop())
+        except OSError:
+            continue
+        subdirs = []
+        for e in entries:
+            yield e
+            try:
+                if e.is_dir(follow_symlinks=False):
+                    subdirs.append(e.path)
+            except OSError:
+                pass
+        stack.extend(reversed(subdirs))
+
+
+@lru_cache(maxsize=256)
+def _folder_tree_summary(dirpath: str) -> Tuple[int, int, Optional[str], Optional[str]]:
+    """
+    One walk of a show folder for both representative_media and total_size_and_count:
+    (total bytes, file count, first VIDEO_TS dir, largest video file).
+    DirEntry type checks come from the dirent, so each file costs a single stat
+    (none on Windows, where scandir returns sizes with the listing). Listings are
+    already read in getdents/getdirentries batches; a getattrlistbulk/statx shim
+    would only save the per-file size stat and is not worth a native dependency.
+    """
+    total, count = 0, 0
+    vts_dir, best, best_size = None, None, 0
+    for e in _walk_entries(dirpath):
+        try:
+            if e.is_file():
+                size = e.stat().st_size
+                total += size
+                count += 1
+                if size > best_size and os.path.splitext(e.name)[1].lower() in VIDEO_EXTS:
+                    best, best_size = e.path, size
+            elif vts_dir is None and e.name.lower() == "video_ts" and e.is_dir():
+                vts_dir = e.path
+        except OSError:
+            continue
+    return total, count, vts_dir, best
+
+
 def dvd_group_segments(folder: Path) -> List[Path]:
-    vts_dir = None
-    for p in folder.rglob("*"):
-        if p.is_dir() and p.name.lower() == "video_ts":
-            vts_dir = p
-            break
-    if not vts_dir:
+    vts = _folder_tree_summary(str(folder))[2]
+    if not vts:
         return []
-    vobs = [p for p in vts_dir.iterdir() if p.is_file() and p.suffix.lower() == ".vob"]
+    vobs = [Path(e.path) for e in _scandir(vts) if os.path.splitext(e.name)[1].lower() == ".vob" and e.is_file()]
     groups: Dict[str, List[Path]] = {}
     for v in vobs:
-        m = re.match(r'(?i)^(VTS_\d{2})_\d+\.VOB$', v.name)
+        m = _RE_VTS_KEY.match(v.name)
         if not m:
             continue
         key = m.group(1).upper()
         groups.setdefault(key, []).append(v)
     best_key, best_total = None, -1
     for k, files in groups.items():
-        files_sorted = sorted(files, key=lambda p: int(re.search(r'_(\d+)\.VOB$', p.name, re.IGNORECASE).group(1)))
+        files_sorted = sorted(files, key=lambda p: int(_RE_VTS_NUM.search(p.name).group(1)))
         groups[k] = files_sorted
         total = sum((p.stat().st_size for p in files_sorted if p.exists()), 0)
         if total > best_total:
@@ -866,28 +1269,15 @@ def representative_media(folder: Path):
     dvd_group = dvd_group_segments(folder)
     if dvd_group:
         return dvd_group, ".vob"
-    best, best_size = None, 0
-    for p in folder.rglob("*"):
-        if p.is_file() and p.suffix.lower() in VIDEO_EXTS:
-            try:
-                s = p.stat().st_size
-                if s > best_size:
-                    best, best_size = p, s
-            except Exception:
-                continue
-    return ([best] if best else []), (best.suffix.lower() if best else "")
+    best = _folder_tree_summary(str(folder))[3]
+    if not best:
+        return [], ""
+    best = Path(best)
+    return [best], best.suffix.lower()
 
 
 def total_size_and_count(folder: Path):
-    total, count = 0, 0
-    for p in folder.rglob("*"):
-        if p.is_file():
-            try:
-                st = p.stat()
-                total += st.st_size
-                count += 1
-            except Exception:
-                pass
+    total, count, _, _ = _folder_tree_summary(str(folder))
     return total, count
 
 
@@ -896,245 +1286,370 @@ def normalize_show_id(folder_path: Path) -> str:
     return h[:12]
 
 
-def scan_roots(roots: List[Path], header_only: bool, no_media: bool, do_checksums: bool, do_drive_id: bool) -> List[Dict[str, str]]:
-    rows = []
-    seen_ids = set()
-    drive_meta_cache: Dict[str, Tuple[str, str]] = {}
-    checksum_to_showid: Dict[str, str] = {}
+def _error_row(fpath: Path) -> Dict[str, str]:
+    return {
+        "ShowID": normalize_show_id(fpath),
+        "Artist": fpath.name,
+        "ShowDate": "",
+        "EventOrFestival": "",
+        "VenueName": "",
+        "City": "",
+        "Country": "",
+        "RecordingType": "",
+        "Generation": "",
+        "Lineage": "",
+        "SourceEquipment": "",
+        "FolderName": fpath.name,
+        "FolderPath": str(fpath.resolve()),
+        "MasterDriveName": "",
+        "MasterDriveID": "",
+        "RepVideoCount": "0",
+        "RepVideoFiles": "",
+        "Container": "",
+        "VideoCodec": "",
+        "Width": "",
+        "Height": "",
+        "DurationSec": "",
+        "AspectRatio": "",
+        "TVStandard": "",
+        "AudioCodec": "",
+        "AudioChannels": "",
+        "AudioSampleRate": "",
+        "FileCount": "0",
+        "TotalSizeBytes": "0",
+        "TotalSizeHuman": "0 B",
+        "ChecksumSHA1": "",
+        "DuplicateOf": "",
+        "Setlist": "",
+        "Notes": "",
+        "LastScannedAt": now_iso(),
+        "ExtractionWarnings": "Unhandled error while scanning this folder",
+    }
 
-    for root in roots:
-        if not root.exists():
-            continue
 
-        label, devid = ("", "")
-        if do_drive_id:
-            cached = drive_meta_cache.get(str(root.resolve()))
-            if cached:
-                label, devid = cached
+def process_folder(fpath: Path, resolved_roots: List[Tuple[str, Path]], header_only: bool, no_media: bool, do_checksums: bool, do_drive_id: bool, tree_checksums: bool = False, checksum_cache: Optional[str] = None) -> Dict[str, str]:
+    """
+    Build the catalog row for one show folder. Runs in a pool worker, so apart from
+    the optional checksum sidecar it only reads the filesystem; DuplicateOf is
+    resolved by scan_roots in walk order.
+    """
+    try:
+        show_id = normalize_show_id(fpath)
+        warnings: List[str] = []
+        notes = collect_notes(fpath, warnings)
+        show_date = guess_date(notes)
+        setlist = extract_setlist(notes)
+
+        # Improved location/event extraction
+        venue, city, country, festival, hint_loc = parse_location(notes, fpath.name)
+        if hint_loc:
+            warnings.append(hint_loc)
+        event_guess, venue_override, hint_evt = extract_event_and_split_venue(notes, venue)
+        if hint_evt:
+            warnings.append(hint_evt)
+        if venue_override:
+            venue = venue_override
+        event_or_festival = event_guess or festival
+
+        rep_files, container = representative_media(fpath)
+        rep_count = len(rep_files)
+        rep_rel: List[str] = []
+        for rf in rep_files:
+            try:
+                rep_rel.append(str(rf.relative_to(fpath)))
+            except Exception:
+                rep_rel.append(str(rf))
+
+        media_info = {
+            "video_codec": "", "width": "", "height": "", "duration_sec": "", "dar": "", "sar": "", "fps": "",
+            "audio_codec": "", "audio_channels": "", "audio_sample_rate": ""
+        }
+        total_dur = 0
+        if not no_media and rep_files:
+            if container == ".vob" and rep_count > 1:
+                for info in probe_segments(rep_files, header_only=header_only):
+                    if not media_info["video_codec"] and info.get("video_codec"):
+                        media_info["video_codec"] = info["video_codec"]
+                    if not media_info["width"] and info.get("width"):
+                        media_info["width"] = info["width"]
+                    if not media_info["height"] and info.get("height"):
+                        media_info["height"] = info["height"]
+                    if not media_info["dar"] and info.get("dar"):
+                        media_info["dar"] = info["dar"]
+                    if not media_info["sar"] and info.get("sar"):
+                        media_info["sar"] = info["sar"]
+                    if not media_info["fps"] and info.get("fps"):
+                        media_info["fps"] = info["fps"]
+                    if not media_info["audio_codec"] and info.get("audio_codec"):
+                        media_info["audio_codec"] = info["audio_codec"]
+                    if not media_info["audio_channels"] and info.get("audio_channels"):
+                        media_info["audio_channels"] = info["audio_channels"]
+                    if not media_info["audio_sample_rate"] and info.get("audio_sample_rate"):
+                        media_info["audio_sample_rate"] = info["audio_sample_rate"]
+                    try:
+                        total_dur += int(info.get("duration_sec") or 0)
+                    except Exception:
+                        pass
+                if total_dur:
+                    media_info["duration_sec"] = str(total_dur)
             else:
-                label, devid = master_drive_label_and_id(root)
-                drive_meta_cache[str(root.resolve())] = (label, devid)
+                media_info = parse_media_info(rep_files[0], header_only=header_only)
 
-        for dirpath, dirnames, filenames in os.walk(root):
-            print(f"Scanning: {dirpath}", flush=True)
-            fpath = Path(dirpath)
-            try:
-                _excluded = {"video_ts", "audio_ts", "info", "nfo", "docs", "artwork", "extras"}
-                if fpath.name.lower() in _excluded:
-                    dirnames[:] = []
-                    continue
+        total_bytes, file_count = total_size_and_count(fpath)
 
-                if not is_show_folder(fpath):
-                    # NEW: if this directory is a container (e.g., the root) but has loose media files,
-                    # add one row per loose file so they aren't lost.
-                    loose = []
-                    for fn in filenames:
-                        p = Path(dirpath) / fn
-                        if p.is_file() and p.suffix.lower() in VIDEO_EXTS:
-                            loose.append(p)
-                    if loose:
-                        for lf in loose:
-                            try:
-                                row = build_row_for_loose_file(lf, roots, header_only, no_media, do_checksums, do_drive_id)
-                                # Deduplicate by ShowID (file path based)
-                                if row["ShowID"] not in seen_ids:
-                                    rows.append(row)
-                                    seen_ids.add(row["ShowID"])
-                            except Exception:
-                                pass
-                    # Do not prune children; allow descent to find nested show folders
-                    continue
+        lineage_text = extract_lineage(notes)
+        source_equip = extract_source_equipment(lineage_text)
+        rec_type = determine_recording_type(notes, fpath)
+        gen = determine_generation(notes, fpath)
 
-                show_id = normalize_show_id(fpath)
-                if show_id in seen_ids:
-                    dirnames[:] = []
-                seen_ids.add(show_id)
-
-                warnings: List[str] = []
-                notes = collect_notes(fpath, warnings)
-                show_date = guess_date(notes)
-                setlist = extract_setlist(notes)
-
-                # Improved location/event extraction
-                venue, city, country, festival, hint_loc = parse_location(notes, fpath.name)
-                if hint_loc:
-                    warnings.append(hint_loc)
-                event_guess, venue_override, hint_evt = extract_event_and_split_venue(notes, venue)
-                if hint_evt:
-                    warnings.append(hint_evt)
-                if venue_override:
-                    venue = venue_override
-                event_or_festival = event_guess or festival
-
-                rep_files, container = representative_media(fpath)
-                rep_count = len(rep_files)
-                rep_rel: List[str] = []
-                for rf in rep_files:
-                    try:
-                        rep_rel.append(str(rf.relative_to(fpath)))
-                    except Exception:
-                        rep_rel.append(str(rf))
-
-                media_info = {
-                    "video_codec": "", "width": "", "height": "", "duration_sec": "", "dar": "", "sar": "", "fps": "",
-                    "audio_codec": "", "audio_channels": "", "audio_sample_rate": ""
-                }
-                total_dur = 0
-                if not no_media and rep_files:
-                    if container == ".vob" and rep_count > 1:
-                        for seg in rep_files:
-                            info = parse_media_info(seg, header_only=header_only)
-                            if not media_info["video_codec"] and info.get("video_codec"):
-                                media_info["video_codec"] = info["video_codec"]
-                            if not media_info["width"] and info.get("width"):
-                                media_info["width"] = info["width"]
-                            if not media_info["height"] and info.get("height"):
-                                media_info["height"] = info["height"]
-                            if not media_info["dar"] and info.get("dar"):
-                                media_info["dar"] = info["dar"]
-                            if not media_info["sar"] and info.get("sar"):
-                                media_info["sar"] = info["sar"]
-                            if not media_info["fps"] and info.get("fps"):
-                                media_info["fps"] = info["fps"]
-                            if not media_info["audio_codec"] and info.get("audio_codec"):
-                                media_info["audio_codec"] = info["audio_codec"]
-                            if not media_info["audio_channels"] and info.get("audio_channels"):
-                                media_info["audio_channels"] = info["audio_channels"]
-                            if not media_info["audio_sample_rate"] and info.get("audio_sample_rate"):
-                                media_info["audio_sample_rate"] = info["audio_sample_rate"]
-                            try:
-                                total_dur += int(info.get("duration_sec") or 0)
-                            except Exception:
-                                pass
-                        if total_dur:
-                            media_info["duration_sec"] = str(total_dur)
-                    else:
-                        media_info = parse_media_info(rep_files[0], header_only=header_only)
+        aspect = derive_aspect_ratio(
+            media_info.get("width", ""), media_info.get("height", ""),
+            media_info.get("dar", ""), media_info.get("sar", ""),
+            media_info.get("video_codec", ""), notes, fpath.name
+        )
+        tvstd = derive_tv_standard(media_info.get("fps", ""))
+
+        mdn_path = master_drive_name_for(fpath, resolved_roots)
+        master_label = ""
+        master_id = ""
+        if mdn_path and do_drive_id:
+            master_label, master_id = master_drive_label_and_id(mdn_path)
+        elif mdn_path:
+            master_label = master_drive_label_and_id(mdn_path)[0]
+
+        row = {
+            "ShowID": show_id,
+            "Artist": resolve_artist(fpath, notes),
+            "ShowDate": show_date,
+            "EventOrFestival": event_or_festival,
+            "VenueName": venue,
+            "City": city,
+            "Country": country,
+            "RecordingType": rec_type,
+            "Generation": gen,
+            "Lineage": lineage_text[:2000],
+            "SourceEquipment": source_equip,
+            "FolderName": fpath.name,
+            "FolderPath": str(_resolved(fpath)),
+            "MasterDriveName": master_label,
+            "MasterDriveID": master_id,
+            "RepVideoCount": str(rep_count),
+            "RepVideoFiles": "; ".join(rep_rel),
+            "Container": container,
+            "VideoCodec": media_info.get("video_codec", ""),
+            "Width": media_info.get("width", ""),
+            "Height": media_info.get("height", ""),
+            "DurationSec": media_info.get("duration_sec", ""),
+            "AspectRatio": aspect,
+            "TVStandard": tvstd,
+            "AudioCodec": media_info.get("audio_codec", ""),
+            "AudioChannels": media_info.get("audio_channels", ""),
+            "AudioSampleRate": media_info.get("audio_sample_rate", ""),
+            "FileCount": str(file_count),
+            "TotalSizeBytes": str(total_bytes),
+            "TotalSizeHuman": human_size(total_bytes),
+            "ChecksumSHA1": "",
+            "DuplicateOf": "",
+            "Setlist": setlist[:2000],
+            "Notes": notes[:8000],
+            "LastScannedAt": now_iso(),
+            "ExtractionWarnings": "; ".join(warnings),
+        }
+        if tree_checksums:
+            row["ChecksumSHA1Tree"] = ""
+
+        if do_checksums and rep_files:
+            folder_key = row["FolderPath"]
+            # ChecksumSHA1 stays the key for merges and screenshots; the tree hash is extra
+            if tree_checksums:
+                row["ChecksumSHA1"], row["ChecksumSHA1Tree"] = cached_checksums(
+                    checksum_cache, folder_key, ("sha1", "tree"), rep_files, total_bytes, sha1_and_tree_of_files)
+            else:
+                row["ChecksumSHA1"], = cached_checksums(
+                    checksum_cache, folder_key, ("sha1",), rep_files, total_bytes, lambda files: (sha1_of_files_in_order(files),))
+        return row
+    except Exception:
+        return _error_row(fpath)
 
-                total_bytes, file_count = total_size_and_count(fpath)
 
-                lineage_text = extract_lineage(notes)
-                source_equip = extract_source_equipment(lineage_text)
-                rec_type = determine_recording_type(notes, fpath)
-                gen = determine_generation(notes, fpath)
+def _catalog_sort_key(values: Tuple[str, ...]) -> Tuple[str, str, str]:
+    """Artist, date (undated last), folder name; values in FIELDNAMES order."""
+    artist, date, folder = (values[i] for i in _SORT_COLS)
+    return (artist or "").lower(), (date or "9999-99-99"), (folder or "").lower()
+
+
+def _read_run(path: str):
+    with open(path, "rb") as f:
+        while True:
+            try:
+                yield pickle.load(f)
+            except EOFError:
+                return
 
-                aspect = derive_aspect_ratio(
-                    media_info.get("width", ""), media_info.get("height", ""),
-                    media_info.get("dar", ""), media_info.get("sar", ""),
-                    media_info.get("video_codec", ""), notes, fpath.name
-                )
-                tvstd = derive_tv_standard(media_info.get("fps", ""))
-
-                mdn_path = master_drive_name_for(fpath, roots)
-                master_label = ""
-                master_id = ""
-                if mdn_path and do_drive_id:
-                    master_label, master_id = master_drive_label_and_id(mdn_path)
-                elif mdn_path:
-                    master_label = master_drive_label_and_id(mdn_path)[0]
-
-                row = {
-                    "ShowID": show_id,
-                    "Artist": resolve_artist(fpath, notes),
-                    "ShowDate": show_date,
-                    "EventOrFestival": event_or_festival,
-                    "VenueName": venue,
-                    "City": city,
-                    "Country": country,
-                    "RecordingType": rec_type,
-                    "Generation": gen,
-                    "Lineage": lineage_text[:2000],
-                    "SourceEquipment": source_equip,
-                    "FolderName": fpath.name,
-                    "FolderPath": str(fpath.resolve()),
-                    "MasterDriveName": master_label,
-                    "MasterDriveID": master_id,
-                    "RepVideoCount": str(rep_count),
-                    "RepVideoFiles": "; ".join(rep_rel),
-                    "Container": container,
-                    "VideoCodec": media_info.get("video_codec", ""),
-                    "Width": media_info.get("width", ""),
-                    "Height": media_info.get("height", ""),
-                    "DurationSec": media_info.get("duration_sec", ""),
-                    "AspectRatio": aspect,
-                    "TVStandard": tvstd,
-                    "AudioCodec": media_info.get("audio_codec", ""),
-                    "AudioChannels": media_info.get("audio_channels", ""),
-                    "AudioSampleRate": media_info.get("audio_sample_rate", ""),
-                    "FileCount": str(file_count),
-                    "TotalSizeBytes": str(total_bytes),
-                    "TotalSizeHuman": human_size(total_bytes),
-                    "ChecksumSHA1": "",
-                    "DuplicateOf": "",
-                    "Setlist": setlist[:2000],
-                    "Notes": notes[:8000],
-                    "LastScannedAt": now_iso(),
-                    "ExtractionWarnings": "; ".join(warnings),
-                }
-
-                if do_checksums and rep_files:
-                    ch = sha1_of_files_in_order(rep_files)
-                    row["ChecksumSHA1"] = ch
-                    if ch and ch in checksum_to_showid:
-                        row["DuplicateOf"] = checksum_to_showid[ch]
-                    elif ch:
-                        checksum_to_showid[ch] = row["ShowID"]
-
-                rows.append(row)
-
-                # Do not descend further once this folder is counted as a show
-                dirnames[:] = []
 
+class RowSpool:
+    """
+    External sort for catalog rows, so memory stays flat on very large libraries.
+    Rows are kept as fieldnames tuples (a row dict's hash table costs several
+    times its values) and spilled to dirpath as sorted runs of SPOOL_RUN_ROWS;
+    iter_sorted heap-merges them. Merge ties go to the earlier run,
+    which keeps the order a single stable sort would give. Early rows (loose-file
+    and error rows) stay in memory and come first on ties, as in scan_roots.
+    """
+
+    def __init__(self, dirpath: str, run_rows: int = SPOOL_RUN_ROWS, fieldnames: Tuple[str, ...] = FIELDNAMES):
+        self.dirpath = dirpath
+        self.run_rows = run_rows
+        # The sort columns lead both header variants, so _catalog_sort_key fits either
+        self._row_values = itemgetter(*fieldnames)
+        self.count = 0
+        self._early: List[Tuple[str, ...]] = []
+        self._buf: List[Tuple[str, ...]] = []
+        self._runs: List[str] = []
+
+    def add(self, row: Dict[str, str], early: bool = False):
+        self.count += 1
+        if early:
+            self._early.append(self._row_values(row))
+            return
+        self._buf.append(self._row_values(row))
+        if len(self._buf) >= self.run_rows:
+            self._spill()
+
+    def _spill(self):
+        self._buf.sort(key=_catalog_sort_key)
+        path = os.path.join(self.dirpath, f"run{len(self._runs):05d}.pickle")
+        with open(path, "wb") as f:
+            for values in self._buf:
+                pickle.dump(values, f, pickle.HIGHEST_PROTOCOL)
+        self._runs.append(path)
+        self._buf = []
+
+    def iter_sorted(self):
+        self._early.sort(key=_catalog_sort_key)
+        self._buf.sort(key=_catalog_sort_key)
+        runs = [_read_run(p) for p in self._runs]
+        return heapq.merge(self._early, *runs, self._buf, key=_catalog_sort_key)
+
+
+def scan_roots(roots: List[Path], header_only: bool, no_media: bool, do_checksums: bool, do_drive_id: bool, workers: int = 1, pool_kind: str = "process", tree_checksums: bool = False, spool: Optional[RowSpool] = None, checksum_cache: Optional[str] = None) -> List[Dict[str, str]]:
+    """
+    Catalog every show folder under roots and return the rows sorted. With a spool,
+    rows are streamed into it as they complete (walk order) and [] is returned.
+    """
+    rows = []  # loose-file and error rows; they precede show rows on sort ties
+    show_rows = []
+    seen_ids = set()
+    checksum_to_showid: Dict[str, str] = {}
+    # (folder, pending row) in walk order; a Future when a worker pool is used
+    shows = deque()
+    resolved_roots = resolve_roots(roots)
+    # Directory listings are only valid for this scan
+    _scandir.cache_clear()
+    _dir_summary.cache_clear()
+    _dir_has_vob.cache_clear()
+    _resolved.cache_clear()
+    _folder_tree_summary.cache_clear()
+    master_drive_label_and_id.cache_clear()
+    if do_checksums and checksum_cache:
+        init_checksum_cache(checksum_cache)
+    # Look each drive up once here; threads share the cache, process workers get a copy
+    # through the pool initializer (spawn and forkserver start with nothing inherited)
+    drives = {root: master_drive_label_and_id(root) for root in roots if root.exists()}
+
+    # Threads suit HDD/NAS scans, where folders wait on metadata and ffprobe rather than
+    # the GIL; processes suit fast local disks, where note parsing is the bottleneck.
+    # Either way results are merged below in walk order, so no locking is needed.
+    executor = ThreadPoolExecutor if pool_kind == "thread" else ProcessPoolExecutor
+    def keep(row: Dict[str, str], early: bool = False):
+        if tree_checksums:
+            row.setdefault("ChecksumSHA1Tree", "")  # loose-file and error rows
+        if spool is not None:
+            spool.add(row, early)
+        else:
+            (rows if early else show_rows).append(row)
+
+    def drain(wait: bool):
+        """Finish pending shows in walk order, so DuplicateOf matches a serial scan."""
+        while shows and (wait or not pool or shows[0][1].done()):
+            fpath, pending = shows.popleft()
+            try:
+                row = pending.result() if pool else pending
             except Exception:
-                dirnames[:] = []
+                row = _error_row(fpath)
+            ch = row["ChecksumSHA1"]
+            if ch and ch in checksum_to_showid:
+                row["DuplicateOf"] = checksum_to_showid[ch]
+            elif ch:
+                checksum_to_showid[ch] = row["ShowID"]
+            keep(row)
+
+    pool_args = {} if pool_kind == "thread" else {
+        "initializer": _init_process_worker,
+        "initargs": (drives, max(1, FFPROBE_MAX_IN_FLIGHT // workers)),
+    }
+    with (executor(max_workers=workers, **pool_args) if workers > 1 else nullcontext()) as pool:
+        for root in roots:
+            if not root.exists():
+                continue
+
+            for dirpath, dirnames, filenames in os.walk(root):
+                drain(wait=False)
+                print(f"Scanning: {dirpath}", flush=True)
+                fpath = Path(dirpath)
                 try:
-                    rows.append({
-                        "ShowID": normalize_show_id(fpath),
-                        "Artist": fpath.name,
-                        "ShowDate": "",
-                        "EventOrFestival": "",
-                        "VenueName": "",
-                        "City": "",
-                        "Country": "",
-                        "RecordingType": "",
-                        "Generation": "",
-                        "Lineage": "",
-                        "SourceEquipment": "",
-                        "FolderName": fpath.name,
-                        "FolderPath": str(fpath.resolve()),
-                        "MasterDriveName": "",
-                        "MasterDriveID": "",
-                        "RepVideoCount": "0",
-                        "RepVideoFiles": "",
-                        "Container": "",
-                        "VideoCodec": "",
-                        "Width": "",
-                        "Height": "",
-                        "DurationSec": "",
-                        "AspectRatio": "",
-                        "TVStandard": "",
-                        "AudioCodec": "",
-                        "AudioChannels": "",
-                        "AudioSampleRate": "",
-                        "FileCount": "0",
-                        "TotalSizeBytes": "0",
-                        "TotalSizeHuman": "0 B",
-                        "ChecksumSHA1": "",
-                        "DuplicateOf": "",
-                        "Setlist": "",
-                        "Notes": "",
-                        "LastScannedAt": now_iso(),
-                        "ExtractionWarnings": "Unhandled error while scanning this folder",
-                    })
+                    # Only a root can arrive here excluded; children are pruned before descent
+                    if fpath.name.lower() in _EXCLUDED_DIR_NAMES:
+                        dirnames[:] = []
+                        continue
+                    dirnames[:] = [d for d in dirnames if d.lower() not in _EXCLUDED_DIR_NAMES]
+
+                    if not is_show_folder(fpath):
+                        # NEW: if this directory is a container (e.g., the root) but has loose media files,
+                        # add one row per loose file so they aren't lost.
+                        loose = []
+                        for fn in filenames:
+                            p = Path(dirpath) / fn
+                            if p.is_file() and p.suffix.lower() in VIDEO_EXTS:
+                                loose.append(p)
+                        if loose:
+                            for lf in loose:
+                                try:
+                                    row = build_row_for_loose_file(lf, roots, header_only, no_media, do_checksums, do_drive_id)
+                                    # Deduplicate by ShowID (file path based)
+                                    if row["ShowID"] not in seen_ids:
+                                        keep(row, early=True)
+                                        seen_ids.add(row["ShowID"])
+                                except Exception:
+                                    pass
+                        # Do not prune children; allow descent to find nested show folders
+                        continue
+
+                    show_id = normalize_show_id(fpath)
+                    if show_id in seen_ids:
+                        dirnames[:] = []
+                    seen_ids.add(show_id)
+
+                    args = (fpath, resolved_roots, header_only, no_media, do_checksums, do_drive_id, tree_checksums, checksum_cache)
+                    shows.append((fpath, pool.submit(process_folder, *args) if pool else process_folder(*args)))
+
+                    # Do not descend further once this folder is counted as a show
+                    dirnames[:] = []
+
                 except Exception:
-                    pass
-                continue
+                    dirnames[:] = []
+                    try:
+                        keep(_error_row(fpath), early=True)
+                    except Exception:
+                        pass
+                    continue
 
-    rows.sort(key=lambda r: (
-        (r.get("Artist") or "").lower(),
-        (r.get("ShowDate") or "9999-99-99"),
-        (r.get("FolderName") or "").lower()
-    ))
+        drain(wait=True)
+
+    if spool is not None:
+        return []
+    rows.extend(show_rows)
+    rows.sort(key=lambda r: _catalog_sort_key(_row_values(r)))
     return rows
 
 
@@ -1145,36 +1660,39 @@ def main():
     ap.add_argument("--no-media", action="store_true", help="Skip media probing for speed")
     ap.add_argument("--header-only", action="store_true", help="Probe only headers using -read_intervals %+10")
     ap.add_argument("--checksums", action="store_true", help="Compute SHA1 over representative media set and detect duplicates")
+    ap.add_argument("--tree-checksums", action="store_true", help="With --checksums, also write a per-segment ChecksumSHA1Tree column, hashed from the same single read as ChecksumSHA1 (which stays the key downstream stages use)")
+    ap.add_argument("--checksum-cache", metavar="SQLITE", help="With --checksums, reuse checksums from this sidecar DB for unchanged folders (created if missing)")
     ap.add_argument("--drive-id", action="store_true", help="Capture stable MasterDriveID when possible")
+    ap.add_argument("--workers", type=int, default=None, help="Parallel per-show cataloging workers (1 = serial; default: CPU count for processes, 4x that up to 32 for threads)")
+    ap.add_argument("--pool", choices=("process", "thread"), default="process", help="Worker kind: 'thread' for I/O-bound scans of HDD/NAS drives")
     args = ap.parse_args()
+    if args.workers is None:
+        args.workers = IO_THREAD_WORKERS if args.pool == "thread" else (os.cpu_count() or 1)
 
     roots = [Path(r).resolve() for r in args.roots]
-    rows = scan_roots(
-        roots,
-        header_only=args.header_only,
-        no_media=args.no_media,
-        do_checksums=args.checksums,
-        do_drive_id=args.drive_id
-    )
-
-    fieldnames = [
-        "ShowID", "Artist", "ShowDate", "EventOrFestival", "VenueName", "City", "Country",
-        "RecordingType", "Generation", "Lineage", "SourceEquipment",
-        "FolderName", "FolderPath", "MasterDriveName", "MasterDriveID",
-        "RepVideoCount", "RepVideoFiles", "Container", "VideoCodec", "Width", "Height", "DurationSec",
-        "AspectRatio", "TVStandard", "AudioCodec", "AudioChannels", "AudioSampleRate",
-        "FileCount", "TotalSizeBytes", "TotalSizeHuman",
-        "ChecksumSHA1", "DuplicateOf",
-        "Setlist", "Notes", "LastScannedAt", "ExtractionWarnings"
-    ]
-
-    with open(args.output, "w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=fieldnames)
-        w.writeheader()
-        for r in rows:
-            w.writerow(r)
-
-    print(f"Wrote {args.output} with {len(rows)} shows.")
+    with tempfile.TemporaryDirectory(prefix="catalog-spool-") as spool_dir:
+        fieldnames = TREE_FIELDNAMES if args.tree_checksums else FIELDNAMES
+        spool = RowSpool(spool_dir, fieldnames=fieldnames)
+        scan_roots(
+            roots,
+            header_only=args.header_only,
+            no_media=args.no_media,
+            do_checksums=args.checksums,
+            do_drive_id=args.drive_id,
+            workers=args.workers,
+            pool_kind=args.pool,
+            tree_checksums=args.tree_checksums,
+            spool=spool,
+            checksum_cache=args.checksum_cache
+        )
+
+        # Positional rows (fieldnames tuples) skip DictWriter's per-row key checks
+        with open(args.output, "w", newline="", encoding="utf-8", buffering=1 << 20) as f:
+            w = csv.writer(f)
+            w.writerow(fieldnames)
+            w.writerows(spool.iter_sorted())
+
+    print(f"Wrote {args.output} with {spool.count} shows.")
 
 
 if __name__ == "__main__":
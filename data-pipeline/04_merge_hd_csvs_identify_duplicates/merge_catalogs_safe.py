@@ -11,26 +11,84 @@ Usage:
       seagate_musicvideo_catalog.csv
 """
 
+import csv
 import pandas as pd
 from pathlib import Path
 from datetime import datetime
 
+try:
+    import pyarrow as pa  # multithreaded CSV parsing (falls back to pandas' C engine)
+    import pyarrow.csv as pacsv
+except Exception:
+    pa = None
+
+try:
+    import polars as pl  # multithreaded dedupe/sort on string columns (falls back to pandas)
+except Exception:
+    pl = None
+
 def normalize_columns(df):
     """Lowercase and strip column names for consistent access."""
     df.columns = [c.strip() for c in df.columns]
     return df
 
+def read_csv_arrow(path):
+    """Every column as str with empty cells as "", parsed by pyarrow; None leaves the file to pandas."""
+    try:
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            header = next(csv.reader(f), None)
+    except (OSError, UnicodeDecodeError, csv.Error):
+        return None
+    if not header or len(set(header)) != len(header):
+        return None
+    # Typed as text inside the reader: pandas' dtype=str on the pyarrow engine casts after
+    # inference, which rewrites values such as 007 -> 7.0 or TRUE -> True
+    options = pacsv.ConvertOptions(column_types={c: pa.string() for c in header}, strings_can_be_null=False)
+    try:
+        table = pacsv.read_csv(path, convert_options=options)
+    except pa.ArrowInvalid:
+        # Newlines inside quoted fields (e.g. raw scan Notes), ragged rows, bad UTF-8
+        return None
+    if table.column_names != header:
+        return None
+    return table.to_pandas()
+
 def load_csv(path):
     print(f"📂 Loading {path} ...")
-    df = pd.read_csv(path, dtype=str, keep_default_na=False)
+    df = read_csv_arrow(path) if pa is not None else None
+    if df is None:
+        df = pd.read_csv(path, dtype=str, keep_default_na=False)
     return normalize_columns(df)
 
-def merge_catalogs(file1, file2):
+def output_path(file1):
+    ts = datetime.now().strftime("%Y-%m-%d_%H%M")
+    return Path(file1).parent / f"merged_catalogs_{ts}.csv"
+
+# Merge rules, shared by merge_frames and merge_frames_polars: a show is keyed on
+# ChecksumSHA1, else ShowID, and the first file's row wins a duplicated key
+KEY_COLUMNS = ("ChecksumSHA1", "ShowID")
+MERGED_FROM = ("Big Daddy", "Seagate")  # origin label for rows of file1, file2
+SORT_COLUMNS = ["Artist", "ShowDate", "FolderName"]
+
+def aligned_columns(df1, df2):
+    """Columns each file gets (as "") before the concat: the union, missing ones sorted."""
+    return sorted(set(df1.columns) | set(df2.columns))
+
+def compute_duplicate_key(df):
+    checksum, fallback = (df[c] for c in KEY_COLUMNS)
+    return checksum.where(checksum != "", fallback)
+
+def duplicate_key_expr():
+    checksum, fallback = (pl.col(c) for c in KEY_COLUMNS)
+    return pl.when(checksum != "").then(checksum).otherwise(fallback)
+
+def merge_frames(file1, file2):
+    """Load, combine and dedupe both catalogs on pandas; returns the sorted deduped frame."""
     df1 = load_csv(file1)
     df2 = load_csv(file2)
 
     # Align columns (ensure same headers)
-    all_cols = sorted(set(df1.columns) | set(df2.columns))
+    all_cols = aligned_columns(df1, df2)
     for df in (df1, df2):
         for c in all_cols:
             if c not in df.columns:
@@ -41,8 +99,7 @@ def merge_catalogs(file1, file2):
     print(f"🧩 Combined total before deduplication: {len(combined)} rows")
 
     # Determine unique key (prefer ChecksumSHA1, else ShowID)
-    combined["__key__"] = combined["ChecksumSHA1"].replace("", pd.NA)
-    combined["__key__"].fillna(combined["ShowID"], inplace=True)
+    combined["__key__"] = compute_duplicate_key(combined)
 
     # Identify duplicates
     duplicates = combined[combined["__key__"].duplicated(keep="first")]
@@ -53,20 +110,59 @@ def merge_catalogs(file1, file2):
 
     # Add info for tracking origin
     deduped["MergedFrom"] = ""
-    deduped.loc[deduped.index < len(df1), "MergedFrom"] = "Big Daddy"
-    deduped.loc[deduped.index >= len(df1), "MergedFrom"] = "Seagate"
+    deduped.loc[deduped.index < len(df1), "MergedFrom"] = MERGED_FROM[0]
+    deduped.loc[deduped.index >= len(df1), "MergedFrom"] = MERGED_FROM[1]
 
     # Add marker for duplicates (for transparency)
     dup_keys = set(duplicates["__key__"].tolist())
-    deduped["DuplicateInOtherFile"] = deduped["__key__"].apply(lambda k: "Yes" if k in dup_keys else "")
+    deduped["DuplicateInOtherFile"] = deduped["__key__"].isin(dup_keys).map({True: "Yes", False: ""})
 
     # Sort by artist/date for readability
-    deduped.sort_values(by=["Artist", "ShowDate", "FolderName"], inplace=True, na_position="last")
+    deduped.sort_values(by=SORT_COLUMNS, inplace=True, na_position="last")
+    return deduped
 
-    # Output file path
-    ts = datetime.now().strftime("%Y-%m-%d_%H%M")
-    out_path = Path(file1).parent / f"merged_catalogs_{ts}.csv"
-    deduped.to_csv(out_path, index=False, encoding="utf-8")
+def load_csv_polars(path):
+    print(f"📂 Loading {path} ...")
+    # Every column as text, with empty cells as "" like keep_default_na=False
+    df = pl.read_csv(path, infer_schema=False).fill_null("")
+    return df.rename(lambda c: c.strip())
+
+def merge_frames_polars(file1, file2):
+    """merge_frames on polars frames, with the same rows, columns and order."""
+    df1 = load_csv_polars(file1)
+    df2 = load_csv_polars(file2)
+
+    all_cols = aligned_columns(df1, df2)
+    df1 = df1.with_columns([pl.lit("").alias(c) for c in all_cols if c not in df1.columns])
+    df2 = df2.with_columns([pl.lit("").alias(c) for c in all_cols if c not in df2.columns])
+
+    combined = pl.concat([df1, df2.select(df1.columns)])
+    print(f"🧩 Combined total before deduplication: {len(combined)} rows")
+
+    combined = combined.with_columns(duplicate_key_expr().alias("__key__")).with_columns(
+        pl.when(pl.int_range(pl.len()) < len(df1)).then(pl.lit(MERGED_FROM[0])).otherwise(pl.lit(MERGED_FROM[1])).alias("MergedFrom"),
+        pl.when(pl.col("__key__").is_duplicated()).then(pl.lit("Yes")).otherwise(pl.lit("")).alias("DuplicateInOtherFile"),
+    )
+
+    deduped = combined.unique(subset="__key__", keep="first", maintain_order=True)
+    print(f"⚠️  Found {len(combined) - len(deduped)} duplicate rows (same ChecksumSHA1 or ShowID)")
+
+    # Stable, like the pandas multi-column sort
+    return deduped.sort(SORT_COLUMNS, maintain_order=True)
+
+def write_csv(df, path):
+    if pl is not None and isinstance(df, pl.DataFrame):
+        # Empty cells as nulls, which write unquoted like pandas' empty strings
+        df.with_columns(pl.all().replace("", None)).write_csv(path)
+    else:
+        df.to_csv(path, index=False, encoding="utf-8")
+
+def merge_catalogs(file1, file2):
+    merge = merge_frames_polars if pl is not None else merge_frames
+    deduped = merge(file1, file2)
+
+    out_path = output_path(file1)
+    write_csv(deduped, out_path)
 
     print(f"✅ Wrote merged catalog: {out_path}")
     print(f"📊 Final unique shows: {len(deduped)} rows")
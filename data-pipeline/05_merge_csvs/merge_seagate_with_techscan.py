@@ -12,9 +12,17 @@ Goal:
   - Output a new enriched Seagate CSV
 """
 
+import csv
 import pandas as pd
 from pathlib import Path
 from datetime import datetime
+from typing import Optional
+
+try:
+    import pyarrow as pa  # multithreaded CSV parsing (falls back to pandas' C engine)
+    import pyarrow.csv as pacsv
+except Exception:
+    pa = None
 
 TECH_COLUMNS = [
     "FolderName", "FolderPath", "MasterDriveName", "MasterDriveID",
@@ -31,9 +39,33 @@ def normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
     df.columns = [c.strip() for c in df.columns]
     return df
 
+def read_csv_arrow(path: Path) -> Optional[pd.DataFrame]:
+    """Every column as str with empty cells as "", parsed by pyarrow; None leaves the file to pandas."""
+    try:
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            header = next(csv.reader(f), None)
+    except (OSError, UnicodeDecodeError, csv.Error):
+        return None
+    if not header or len(set(header)) != len(header):
+        return None
+    # Typed as text inside the reader: pandas' dtype=str on the pyarrow engine casts after
+    # inference, which rewrites values such as 007 -> 7.0 or TRUE -> True
+    options = pacsv.ConvertOptions(column_types={c: pa.string() for c in header}, strings_can_be_null=False)
+    try:
+        table = pacsv.read_csv(path, convert_options=options)
+    except pa.ArrowInvalid:
+        # Newlines inside quoted fields (e.g. raw scan Notes), ragged rows, bad UTF-8
+        return None
+    if table.column_names != header:
+        return None
+    return table.to_pandas()
+
+
 def load_csv(path: Path) -> pd.DataFrame:
     print(f"📂 Loading {path} ...")
-    df = pd.read_csv(path, dtype=str, keep_default_na=False)
+    df = read_csv_arrow(path) if pa is not None else None
+    if df is None:
+        df = pd.read_csv(path, dtype=str, keep_default_na=False)
     return normalize_columns(df)
 
 def enrich_seagate(manual_path: Path, techscan_path: Path) -> Path:
@@ -54,38 +86,28 @@ def enrich_seagate(manual_path: Path, techscan_path: Path) -> Path:
             if c not in df.columns:
                 df[c] = ""
 
-    manual_idx = manual.set_index("ShowID", drop=False)
-    tech_idx = tech.set_index("ShowID", drop=False)
+    manual_idx = manual.set_index("ShowID", drop=False).rename_axis(None)[all_cols]
+    tech_idx = tech.set_index("ShowID", drop=False).rename_axis(None)[all_cols]
 
     all_ids = sorted(set(manual_idx.index) | set(tech_idx.index))
 
-    merged_rows = []
-    for sid in all_ids:
-        # Start from your manual/edited row if it exists
-        if sid in manual_idx.index:
-            base = manual_idx.loc[sid].copy()
-        else:
-            base = tech_idx.loc[sid].copy()
-
-        if sid in tech_idx.index:
-            new = tech_idx.loc[sid]
-            for col in all_cols:
-                if col in TECH_COLUMNS:
-                    # For Seagate, we want to keep existing ChecksumSHA1 from manual,
-                    # so don't overwrite non-empty checksum with empty techscan checksum.
-                    if col == "ChecksumSHA1":
-                        continue
-                    val = str(new.get(col, "")).strip()
-                    if val:
-                        base[col] = val
-                else:
-                    current = str(base.get(col, "")).strip()
-                    if not current:
-                        base[col] = str(new.get(col, "")).strip()
-
-        merged_rows.append(base)
-
-    enriched = pd.DataFrame(merged_rows, columns=all_cols)
+    # Start from your manual/edited row if it exists, else the techscan row
+    enriched = manual_idx.reindex(all_ids, fill_value="")
+    tech_only = ~enriched.index.isin(manual_idx.index)
+    enriched[tech_only] = tech_idx.reindex(enriched.index[tech_only])
+
+    # Masked merge over whole column blocks: techscan values win for tech columns,
+    # fill blanks elsewhere. For Seagate, we want to keep existing ChecksumSHA1 from
+    # manual, so don't overwrite non-empty checksum with empty techscan checksum.
+    in_tech = enriched.index.isin(tech_idx.index)[:, None]
+    tech_cols = [c for c in all_cols if c in TECH_COLUMNS and c != "ChecksumSHA1"]
+    other_cols = [c for c in all_cols if c not in TECH_COLUMNS]
+    new = tech_idx.reindex(all_ids, fill_value="").apply(lambda col: col.str.strip())
+    fresh = new[tech_cols] != ""
+    enriched[tech_cols] = enriched[tech_cols].mask(in_tech & fresh, new[tech_cols])
+    blank = enriched[other_cols].apply(lambda col: col.str.strip() == "")
+    enriched[other_cols] = enriched[other_cols].mask(in_tech & blank, new[other_cols])
+    enriched = enriched.reset_index(drop=True)
 
     # Optional: sort for sanity
     sort_cols = [c for c in ["Artist", "ShowDate", "FolderName"] if c in enriched.columns]
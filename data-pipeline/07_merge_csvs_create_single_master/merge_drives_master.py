@@ -12,108 +12,260 @@ Usage:
       SEAGATE_enriched_with_tech_2025-11-06_0930.csv
 """
 
+import csv
+import numpy as np
 import pandas as pd
 from pathlib import Path
 from datetime import datetime
+from typing import List, Optional
+
+try:
+    import pyarrow as pa  # multithreaded CSV reader/writer for the pandas path
+    import pyarrow.csv as pacsv
+    import pyarrow.parquet as papq
+except Exception:
+    pa = None
+
+try:
+    import duckdb  # vectorized SQL merge straight off the CSVs (preferred when installed)
+except Exception:
+    duckdb = None
 
 def normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
+    # Renames in place: callers hand over a frame fresh from read_csv
     df.columns = [c.strip() for c in df.columns]
     return df
 
+def csv_header(path: Path) -> Optional[List[str]]:
+    """The header row as the csv module reads it; None if the file can't be read that way."""
+    try:
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            return next(csv.reader(f), None)
+    except (OSError, UnicodeDecodeError, csv.Error):
+        return None
+
+def read_csv_arrow(path: Path) -> Optional[pd.DataFrame]:
+    """Every column as str with empty cells as "", parsed by pyarrow; None leaves the file to pandas."""
+    header = csv_header(path)
+    if not header or len(set(header)) != len(header):
+        return None
+    # Typed as text inside the reader: pandas' dtype=str on the pyarrow engine casts after
+    # inference, which rewrites values such as 007 -> 7.0 or TRUE -> True
+    options = pacsv.ConvertOptions(column_types={c: pa.string() for c in header}, strings_can_be_null=False)
+    try:
+        table = pacsv.read_csv(path, convert_options=options)
+    except pa.ArrowInvalid:
+        # Newlines inside quoted fields (e.g. raw scan Notes), ragged rows, bad UTF-8
+        return None
+    if table.column_names != header:
+        return None
+    return table.to_pandas()
+
+def read_csv_text(path: Path) -> pd.DataFrame:
+    """Every column as str with empty cells as "", parsed by pyarrow when it can."""
+    if pa is not None:
+        df = read_csv_arrow(path)
+        if df is not None:
+            return df
+    return pd.read_csv(path, dtype=str, keep_default_na=False)
+
 def load_catalog(path: Path, source_name: str) -> pd.DataFrame:
     print(f"📂 Loading {source_name} catalog: {path}")
-    df = pd.read_csv(path, dtype=str, keep_default_na=False)
-    df = normalize_columns(df)
+    df = normalize_columns(read_csv_text(path))
     df["SourceCatalog"] = source_name
     return df
 
+def sql_ident(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+def sql_text(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+# Dedupe rules, shared by merge_frames and merge_frames_duckdb: rows key on ChecksumSHA1,
+# else ShowID, and each key's primary is its first preferred row, else its first row
+KEY_COLUMNS = ("ChecksumSHA1", "ShowID")
+PREFERRED_CATALOG = "BigDaddy"
+SORT_COLUMNS = ("Artist", "ShowDate", "FolderName")
+
 def compute_duplicate_key(df: pd.DataFrame) -> pd.Series:
     # Prefer ChecksumSHA1; fallback to ShowID
-    checksum = df["ChecksumSHA1"].replace("", pd.NA)
-    key = checksum.copy()
-    no_checksum = key.isna()
-    key[no_checksum] = df.loc[no_checksum, "ShowID"]
-    return key.fillna("")
+    checksum, fallback = (df[c] for c in KEY_COLUMNS)
+    return checksum.where(checksum != "", fallback)
 
-def merge_catalogs(big_path: Path, seagate_path: Path):
-    # Load both catalogs
-    big = load_catalog(big_path, "BigDaddy")
-    sea = load_catalog(seagate_path, "Seagate")
+def duplicate_key_sql() -> str:
+    checksum, fallback = (sql_ident(c) for c in KEY_COLUMNS)
+    return f"CASE WHEN {checksum} <> '' THEN {checksum} ELSE {fallback} END"
+
+def is_preferred(source: pd.Series, key: pd.Series) -> pd.Series:
+    """Rows that win their key: Big Daddy's, and every row without a key."""
+    return (source == PREFERRED_CATALOG) | (key == "")
 
-    # Preserve column order from Big Daddy, append any extra columns from Seagate
-    big_cols = list(big.columns)
-    sea_cols = [c for c in sea.columns if c not in big_cols]
-    all_cols = big_cols + sea_cols
+def preferred_sql(source: str, key: str) -> str:
+    return f"({source} = {sql_text(PREFERRED_CATALOG)} OR {key} = '')"
 
-    # Ensure both have all columns
-    for df in (big, sea):
-        for c in all_cols:
-            if c not in df.columns:
-                df[c] = ""
+def merge_frames(big_path: Path, seagate_path: Path):
+    """Load, combine and dedupe both catalogs: (sorted master rows, duplicates report, duplicate groups)."""
+    # Load both catalogs
+    big = load_catalog(big_path, PREFERRED_CATALOG)
+    sea = load_catalog(seagate_path, "Seagate")
 
-    # Combine
-    combined = pd.concat([big[all_cols], sea[all_cols]], ignore_index=True)
+    # Combine: preserve column order from Big Daddy, append any extra columns from Seagate,
+    # and fill the cells of columns a catalog lacks with ""
+    combined = pd.concat([big, sea], ignore_index=True, join="outer", sort=False).fillna("")
     print(f"🧩 Combined rows before dedupe: {len(combined)}")
 
     # Compute duplicate key
     combined["DuplicateKey"] = compute_duplicate_key(combined)
+    # Dedupe below hashes and compares these per row; as categories that is on int codes
+    combined["DuplicateKey"] = combined["DuplicateKey"].astype("category")
+    combined["SourceCatalog"] = combined["SourceCatalog"].astype("category")
 
-    # Identify duplicate groups
-    key_counts = combined["DuplicateKey"].value_counts()
-    dup_keys = set(key_counts[key_counts > 1].index)
-
-    # Mark primary rows: prefer BigDaddy when duplicates exist
-    is_primary = []
-    primary_catalog_for_key = {}
-
-    # Precompute groups
-    grouped = combined.groupby("DuplicateKey", sort=False)
-
-    for key, group in grouped:
-        if key == "" or key not in dup_keys:
-            # Either no key or unique key: first occurrence is primary
-            idxs = list(group.index)
-            for i, idx in enumerate(idxs):
-                is_primary.append((idx, "Yes" if i == 0 else "No"))
-            if idxs:
-                primary_catalog_for_key[key] = combined.loc[idxs[0], "SourceCatalog"]
-        else:
-            # Duplicate group
-            # Prefer BigDaddy row as primary if present
-            big_rows = group[group["SourceCatalog"] == "BigDaddy"]
-            if not big_rows.empty:
-                primary_idx = big_rows.index[0]
-            else:
-                primary_idx = group.index[0]
-
-            for idx in group.index:
-                is_primary.append((idx, "Yes" if idx == primary_idx else "No"))
-
-            primary_catalog_for_key[key] = combined.loc[primary_idx, "SourceCatalog"]
+    # Duplicate groups: one count per key code, reused by the report below
+    codes = combined["DuplicateKey"].cat.codes.to_numpy()
+    key_counts = np.bincount(codes)
+    is_dup = key_counts[codes] > 1
+    dup_groups = int((key_counts > 1).sum())
+
+    # Mark primary rows: prefer BigDaddy when duplicates exist. Each key's primary is
+    # its first preferred row, else its first row; rows without a key only keep the first.
+    key = combined["DuplicateKey"]
+    preferred = is_preferred(combined["SourceCatalog"], key)
+    preferred_keys = key[preferred]
+    primary = preferred & ~preferred_keys.duplicated().reindex(combined.index, fill_value=True)
+    # Keys with no preferred row, from the same key codes as the counts above
+    has_preferred = np.bincount(codes[preferred.to_numpy()], minlength=len(key_counts)) > 0
+    primary |= ~has_preferred[codes] & ~key.duplicated()
 
     # Attach IsPrimary flag
-    primary_map = {idx: val for idx, val in is_primary}
-    combined["IsPrimary"] = combined.index.map(primary_map)
+    combined["IsPrimary"] = np.where(primary, "Yes", "No")
+    primary_catalog_for_key = dict(zip(key[primary], combined.loc[primary, "SourceCatalog"]))
 
-    # Attach PrimaryCatalog column
-    combined["PrimaryCatalog"] = combined["DuplicateKey"].map(
-        lambda k: primary_catalog_for_key.get(k, combined.loc[combined["DuplicateKey"] == k, "SourceCatalog"].iloc[0] if (combined["DuplicateKey"] == k).any() else "")
-    )
+    # Attach PrimaryCatalog column (every key has exactly one primary row)
+    combined["PrimaryCatalog"] = combined["DuplicateKey"].map(primary_catalog_for_key)
 
     # Duplicates report: all rows where that DuplicateKey appears more than once
-    duplicates_report = combined[combined["DuplicateKey"].isin(dup_keys)].copy()
+    duplicates_report = combined[is_dup].copy()
 
     # Master unique: keep only primary rows
-    master_unique = combined[combined["IsPrimary"] == "Yes"].copy()
+    master_unique = combined[primary].copy()
 
     # Sort master for readability
-    sort_cols = [c for c in ["Artist", "ShowDate", "FolderName"] if c in master_unique.columns]
+    sort_cols = [c for c in SORT_COLUMNS if c in master_unique.columns]
     if sort_cols:
         master_unique.sort_values(by=sort_cols, inplace=True)
 
+    return master_unique, duplicates_report, dup_groups
+
+def load_catalog_duckdb(con, path: Path, source_name: str) -> "duckdb.DuckDBPyRelation":
+    print(f"📂 Loading {source_name} catalog: {path}")
+    rel = con.read_csv(str(path), header=True, all_varchar=True, delimiter=",", quotechar='"', escapechar='"')
+    # Ragged rows raise duckdb.Error and the caller merges with pandas instead (null_padding
+    # would need the serial reader whenever Notes hold quoted newlines); a dialect sniffed
+    # into a different column count is sent the same way
+    header = csv_header(path)
+    if header is None or len(rel.columns) != len(header):
+        raise duckdb.InvalidInputException(f"{path}: rows do not match the header")
+    # Every column as text with empty cells as "", SourceCatalog set as in load_catalog,
+    # plus each row's position in the file (the streaming window keeps scan order)
+    select = []
+    for raw in rel.columns:
+        name = raw.strip()
+        value = sql_text(source_name) if name == "SourceCatalog" else f"COALESCE({sql_ident(raw)}, '')"
+        select.append(f"{value} AS {sql_ident(name)}")
+    if "SourceCatalog" not in (c.strip() for c in rel.columns):
+        select.append(f"{sql_text(source_name)} AS SourceCatalog")
+    return rel.project(", ".join(select + ["row_number() OVER () AS __row"]))
+
+def merge_frames_duckdb(big_path: Path, seagate_path: Path):
+    """merge_frames as one DuckDB query over both CSVs, with the same columns, rows and order."""
+    con = duckdb.connect()
+    load_catalog_duckdb(con, big_path, PREFERRED_CATALOG).create_view("big")
+    load_catalog_duckdb(con, seagate_path, "Seagate").create_view("sea")
+
+    # Big Daddy's column order, then any extra Seagate columns (filled with "")
+    big_cols = con.table("big").columns[:-1]
+    all_cols = big_cols + [c for c in con.table("sea").columns[:-1] if c not in big_cols]
+    filled = ", ".join(f"COALESCE({sql_ident(c)}, '') AS {sql_ident(c)}" for c in all_cols)
+
+    # Same rule as merge_frames: each key's primary is its first BigDaddy row, else its
+    # first row, and rows without a key only keep the first
+    con.execute(f"""
+        CREATE TEMP TABLE combined AS
+        WITH unioned AS (
+            SELECT *, 0 AS __src FROM big UNION ALL BY NAME SELECT *, 1 AS __src FROM sea
+        ), keyed AS (
+            SELECT {filled}, __src, __row FROM unioned
+        ), keyed_dup AS (
+            SELECT *, {duplicate_key_sql()} AS __key FROM keyed
+        )
+        SELECT *,
+            row_number() OVER w AS __rank,
+            count(*) OVER (PARTITION BY __key) AS __count,
+            first_value(SourceCatalog) OVER w AS __primary_catalog
+        FROM keyed_dup
+        WINDOW w AS (
+            PARTITION BY __key
+            ORDER BY {preferred_sql('SourceCatalog', '__key')} DESC, __src, __row
+        )
+    """)
+    print(f"🧩 Combined rows before dedupe: {con.table('combined').shape[0]}")
+
+    # Output columns as merge_frames assigns them: replaced in place, else appended
+    computed = {
+        "DuplicateKey": "__key",
+        "IsPrimary": "CASE WHEN __rank = 1 THEN 'Yes' ELSE 'No' END",
+        "PrimaryCatalog": "__primary_catalog",
+    }
+    out_cols = all_cols + [c for c in computed if c not in all_cols]
+    out = ", ".join(f"{computed.get(c, sql_ident(c))} AS {sql_ident(c)}" for c in out_cols)
+
+    sort_cols = [sql_ident(c) for c in SORT_COLUMNS if c in all_cols]
+    master_unique = con.sql(
+        f"SELECT {out} FROM combined WHERE __rank = 1 ORDER BY {', '.join(sort_cols + ['__src', '__row'])}"
+    )
+    duplicates_report = con.sql(f"SELECT {out} FROM combined WHERE __count > 1 ORDER BY __src, __row")
+    dup_groups = con.sql("SELECT count(DISTINCT __key) FROM combined WHERE __count > 1").fetchone()[0]
+
+    return master_unique, duplicates_report, dup_groups
+
+def write_csv(df, path: Path):
+    if duckdb is not None and isinstance(df, duckdb.DuckDBPyRelation):
+        # Empty cells as nulls, which write unquoted like pandas' empty strings
+        df.project(", ".join(f"NULLIF({sql_ident(c)}, '') AS {sql_ident(c)}" for c in df.columns)) \
+            .write_csv(str(path), header=True)
+    elif pa is not None:
+        # Arrow's writer quotes every text field; the values read back unchanged
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        table = table.cast(pa.schema([(f.name, pa.string()) for f in table.schema]))
+        pacsv.write_csv(table, path)
+    else:
+        df.to_csv(path, index=False, encoding="utf-8")
+
+def write_parquet(df, path: Path) -> bool:
+    """Columnar copy of a CSV for the next stage to load instead; False when no writer is installed."""
+    if duckdb is not None and isinstance(df, duckdb.DuckDBPyRelation):
+        df.write_parquet(str(path), compression="zstd")
+    elif pa is not None:
+        # Plain text columns (not the categories used for the dedupe), empty cells as ""
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        table = table.cast(pa.schema([(f.name, pa.string()) for f in table.schema]))
+        papq.write_table(table, path, compression="zstd")
+    else:
+        return False
+    return True
+
+def merge_catalogs(big_path: Path, seagate_path: Path):
+    merged = None
+    if duckdb is not None:
+        try:
+            merged = merge_frames_duckdb(big_path, seagate_path)
+        except duckdb.Error as e:
+            # Input DuckDB's reader won't take the way pandas does (e.g. ragged rows)
+            print(f"⚠️ DuckDB could not load the catalogs, merging with pandas: {str(e).splitlines()[0]}")
+    master_unique, duplicates_report, dup_groups = merged or merge_frames(big_path, seagate_path)
+
     print(f"✅ Unique shows in master: {len(master_unique)}")
-    print(f"⚠️ Duplicate groups: {len(dup_keys)} (rows in duplicates report: {len(duplicates_report)})")
+    print(f"⚠️ Duplicate groups: {dup_groups} (rows in duplicates report: {len(duplicates_report)})")
 
     # Output paths
     ts = datetime.now().strftime("%Y-%m-%d_%H%M")
@@ -122,12 +274,18 @@ def merge_catalogs(big_path: Path, seagate_path: Path):
     master_path = out_dir / f"MASTER_merged_shows_{ts}.csv"
     dup_path = out_dir / f"MASTER_duplicates_report_{ts}.csv"
 
-    master_unique.to_csv(master_path, index=False, encoding="utf-8")
-    duplicates_report.to_csv(dup_path, index=False, encoding="utf-8")
+    write_csv(master_unique, master_path)
+    write_csv(duplicates_report, dup_path)
 
     print(f"💾 Wrote master merged catalog: {master_path}")
     print(f"💾 Wrote duplicates report:     {dup_path}")
 
+    # Parquet copy of the master next to the CSV, which merge_master_with_untitled.py
+    # loads instead of re-parsing the CSV
+    parquet_path = master_path.with_suffix(".parquet")
+    if write_parquet(master_unique, parquet_path):
+        print(f"💾 Wrote master Parquet copy:   {parquet_path}")
+
     return master_path, dup_path
 
 if __name__ == "__main__":
@@ -16,20 +16,75 @@ Behavior:
       * NEW_MASTER_duplicates_report_YYYY-MM-DD_HHMM.csv
 """
 
+import csv
+import numpy as np
 import pandas as pd
 from pathlib import Path
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
+
+try:
+    import pyarrow as pa  # multithreaded CSV reader/writer for the pandas path
+    import pyarrow.csv as pacsv
+except Exception:
+    pa = None
+
+try:
+    import duckdb  # vectorized SQL merge straight off the CSVs (preferred when installed)
+except Exception:
+    duckdb = None
 
 def normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
+    # Renames in place: callers hand over a frame fresh from read_csv
     df.columns = [c.strip() for c in df.columns]
     return df
 
+def parquet_copy(path: Path) -> Optional[Path]:
+    """The Parquet copy an upstream stage wrote next to this CSV, unless the CSV is newer."""
+    parquet_path = path.with_suffix(".parquet")
+    if parquet_path.is_file() and parquet_path.stat().st_mtime >= path.stat().st_mtime:
+        return parquet_path
+    return None
+
+def csv_header(path: Path) -> Optional[List[str]]:
+    """The header row as the csv module reads it; None if the file can't be read that way."""
+    try:
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            return next(csv.reader(f), None)
+    except (OSError, UnicodeDecodeError, csv.Error):
+        return None
+
+def read_csv_arrow(path: Path) -> Optional[pd.DataFrame]:
+    """Every column as str with empty cells as "", parsed by pyarrow; None leaves the file to pandas."""
+    header = csv_header(path)
+    if not header or len(set(header)) != len(header):
+        return None
+    # Typed as text inside the reader: pandas' dtype=str on the pyarrow engine casts after
+    # inference, which rewrites values such as 007 -> 7.0 or TRUE -> True
+    options = pacsv.ConvertOptions(column_types={c: pa.string() for c in header}, strings_can_be_null=False)
+    try:
+        table = pacsv.read_csv(path, convert_options=options)
+    except pa.ArrowInvalid:
+        # Newlines inside quoted fields (e.g. raw scan Notes), ragged rows, bad UTF-8
+        return None
+    if table.column_names != header:
+        return None
+    return table.to_pandas()
+
+def read_csv_text(path: Path) -> pd.DataFrame:
+    """Every column as str with empty cells as "", from its Parquet copy or parsed by pyarrow when it can."""
+    if pa is not None:
+        parquet_path = parquet_copy(path)
+        if parquet_path is not None:
+            return pd.read_parquet(parquet_path)
+        df = read_csv_arrow(path)
+        if df is not None:
+            return df
+    return pd.read_csv(path, dtype=str, keep_default_na=False)
+
 def load_catalog(path: Path, source_label: Optional[str] = None) -> pd.DataFrame:
     print(f"📂 Loading catalog: {path}")
-    df = pd.read_csv(path, dtype=str, keep_default_na=False)
-    df = normalize_columns(df)
+    df = normalize_columns(read_csv_text(path))
 
     # Ensure SourceCatalog exists; if not, set it
     if "SourceCatalog" not in df.columns:
@@ -41,98 +96,192 @@ def load_catalog(path: Path, source_label: Optional[str] = None) -> pd.DataFrame
 
     return df
 
+def sql_ident(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+def sql_text(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+# Dedupe rules, shared by merge_frames and merge_frames_duckdb: rows key on ChecksumSHA1,
+# else ShowID, and each key's primary is its first preferred row, else its first row
+KEY_COLUMNS = ("ChecksumSHA1", "ShowID")
+NEW_CATALOG = "Untitled"
+SORT_COLUMNS = ("Artist", "ShowDate", "FolderName")
+
 def compute_duplicate_key(df: pd.DataFrame) -> pd.Series:
     # Prefer checksum; fallback to ShowID
-    checksum = df["ChecksumSHA1"].replace("", pd.NA)
-    key = checksum.copy()
-    no_checksum = key.isna()
-    key[no_checksum] = df.loc[no_checksum, "ShowID"]
-    return key.fillna("")
+    checksum, fallback = (df[c] for c in KEY_COLUMNS)
+    return checksum.where(checksum != "", fallback)
 
-def merge_master_with_untitled(master_path: Path, untitled_path: Path):
+def duplicate_key_sql() -> str:
+    checksum, fallback = (sql_ident(c) for c in KEY_COLUMNS)
+    return f"CASE WHEN {checksum} <> '' THEN {checksum} ELSE {fallback} END"
+
+def is_preferred(source: pd.Series, key: pd.Series) -> pd.Series:
+    """Rows that win their key: the existing MASTER's (anything not Untitled), and every row without a key."""
+    return (source != NEW_CATALOG) | (key == "")
+
+def preferred_sql(source: str, key: str) -> str:
+    return f"({source} <> {sql_text(NEW_CATALOG)} OR {key} = '')"
+
+def merge_frames(master_path: Path, untitled_path: Path):
+    """Load, combine and dedupe both catalogs: (sorted new master, duplicates report, duplicate groups)."""
     # Load existing master (already deduped BigDaddy + Seagate)
     master = load_catalog(master_path, None)
 
     # Load Untitled catalog; tag rows as Untitled
-    unt = load_catalog(untitled_path, "Untitled")
-
-    # Preserve column order from master; append any new columns from Untitled
-    master_cols = list(master.columns)
-    unt_cols_extra = [c for c in unt.columns if c not in master_cols]
-    all_cols = master_cols + unt_cols_extra
+    unt = load_catalog(untitled_path, NEW_CATALOG)
 
-    # Ensure both have all columns
-    for df in (master, unt):
-        for c in all_cols:
-            if c not in df.columns:
-                df[c] = ""
-
-    # Combine
-    combined = pd.concat([master[all_cols], unt[all_cols]], ignore_index=True)
+    # Combine: preserve column order from master; append any new columns from Untitled,
+    # and fill the cells of columns a catalog lacks with ""
+    combined = pd.concat([master, unt], ignore_index=True, join="outer", sort=False).fillna("")
     print(f"🧩 Combined rows before dedupe: {len(combined)}")
 
     # Compute duplicate key
     combined["DuplicateKey"] = compute_duplicate_key(combined)
-
-    # Group by DuplicateKey
-    key_counts = combined["DuplicateKey"].value_counts()
-    dup_keys = set(key_counts[key_counts > 1].index)
-
-    # Decide primary rows
-    is_primary = []
-    primary_catalog_for_key = {}
-
-    grouped = combined.groupby("DuplicateKey", sort=False)
-
-    for key, group in grouped:
-        idxs = list(group.index)
-        # If no key or it's unique -> first row is primary
-        if key == "" or key not in dup_keys:
-            for i, idx in enumerate(idxs):
-                is_primary.append((idx, "Yes" if i == 0 else "No"))
-            if idxs:
-                primary_catalog_for_key[key] = combined.loc[idxs[0], "SourceCatalog"]
-            continue
-
-        # Duplicate group: prefer any non-Untitled row as primary (i.e., existing MASTER)
-        non_unt = group[group["SourceCatalog"] != "Untitled"]
-        if not non_unt.empty:
-            primary_idx = non_unt.index[0]
-        else:
-            primary_idx = idxs[0]
-
-        for idx in idxs:
-            is_primary.append((idx, "Yes" if idx == primary_idx else "No"))
-
-        primary_catalog_for_key[key] = combined.loc[primary_idx, "SourceCatalog"]
+    # Dedupe below hashes and compares these per row; as categories that is on int codes
+    combined["DuplicateKey"] = combined["DuplicateKey"].astype("category")
+    combined["SourceCatalog"] = combined["SourceCatalog"].astype("category")
+
+    # Duplicate groups: one count per key code, reused by the report below
+    codes = combined["DuplicateKey"].cat.codes.to_numpy()
+    key_counts = np.bincount(codes)
+    is_dup = key_counts[codes] > 1
+    dup_groups = int((key_counts > 1).sum())
+
+    # Decide primary rows: prefer any non-Untitled row (i.e., existing MASTER). Each key's
+    # primary is its first preferred row, else its first row; rows without a key only keep the first.
+    key = combined["DuplicateKey"]
+    preferred = is_preferred(combined["SourceCatalog"], key)
+    preferred_keys = key[preferred]
+    primary = preferred & ~preferred_keys.duplicated().reindex(combined.index, fill_value=True)
+    # Keys with no preferred row, from the same key codes as the counts above
+    has_preferred = np.bincount(codes[preferred.to_numpy()], minlength=len(key_counts)) > 0
+    primary |= ~has_preferred[codes] & ~key.duplicated()
 
     # Attach IsPrimary flag
-    primary_map = {idx: flag for idx, flag in is_primary}
-    combined["IsPrimary"] = combined.index.map(primary_map)
-
-    # Attach PrimaryCatalog column
-    def get_primary_catalog(k: str) -> str:
-        if k in primary_catalog_for_key:
-            return primary_catalog_for_key[k]
-        # Fallback: first SourceCatalog for that key
-        rows = combined[combined["DuplicateKey"] == k]
-        return rows["SourceCatalog"].iloc[0] if not rows.empty else ""
+    combined["IsPrimary"] = np.where(primary, "Yes", "No")
+    primary_catalog_for_key = dict(zip(key[primary], combined.loc[primary, "SourceCatalog"]))
 
-    combined["PrimaryCatalog"] = combined["DuplicateKey"].map(get_primary_catalog)
+    # Attach PrimaryCatalog column (every key has exactly one primary row)
+    combined["PrimaryCatalog"] = combined["DuplicateKey"].map(primary_catalog_for_key)
 
     # Build duplicates report: all rows where DuplicateKey appears more than once
-    duplicates_report = combined[combined["DuplicateKey"].isin(dup_keys)].copy()
+    duplicates_report = combined[is_dup].copy()
 
     # Build new master: only primary rows
-    new_master = combined[combined["IsPrimary"] == "Yes"].copy()
+    new_master = combined[primary].copy()
 
     # Sort master logically for readability
-    sort_cols = [c for c in ["Artist", "ShowDate", "FolderName"] if c in new_master.columns]
+    sort_cols = [c for c in SORT_COLUMNS if c in new_master.columns]
     if sort_cols:
         new_master.sort_values(by=sort_cols, inplace=True)
 
+    return new_master, duplicates_report, dup_groups
+
+def load_catalog_duckdb(con, path: Path, source_label: Optional[str] = None) -> "duckdb.DuckDBPyRelation":
+    print(f"📂 Loading catalog: {path}")
+    parquet_path = parquet_copy(path)
+    if parquet_path is not None:
+        rel = con.read_parquet(str(parquet_path))
+    else:
+        rel = con.read_csv(str(path), header=True, all_varchar=True, delimiter=",", quotechar='"', escapechar='"')
+        # Ragged rows raise duckdb.Error and the caller merges with pandas instead (null_padding
+        # would need the serial reader whenever Notes hold quoted newlines); a dialect sniffed
+        # into a different column count is sent the same way
+        header = csv_header(path)
+        if header is None or len(rel.columns) != len(header):
+            raise duckdb.InvalidInputException(f"{path}: rows do not match the header")
+    # Every column as text with empty cells as "", the same SourceCatalog rules as
+    # load_catalog, plus each row's position in the file (the streaming window keeps scan order)
+    select = []
+    for raw in rel.columns:
+        name = raw.strip()
+        value = f"COALESCE({sql_ident(raw)}, '')"
+        if name == "SourceCatalog" and source_label:
+            value = f"CASE WHEN {value} = '' THEN {sql_text(source_label)} ELSE {value} END"
+        select.append(f"{value} AS {sql_ident(name)}")
+    if "SourceCatalog" not in (c.strip() for c in rel.columns):
+        select.append(f"{sql_text(source_label or 'Master')} AS SourceCatalog")
+    return rel.project(", ".join(select + ["row_number() OVER () AS __row"]))
+
+def merge_frames_duckdb(master_path: Path, untitled_path: Path):
+    """merge_frames as one DuckDB query over both CSVs, with the same columns, rows and order."""
+    con = duckdb.connect()
+    load_catalog_duckdb(con, master_path, None).create_view("master")
+    load_catalog_duckdb(con, untitled_path, NEW_CATALOG).create_view("unt")
+
+    # Master's column order, then any new Untitled columns (filled with "")
+    master_cols = con.table("master").columns[:-1]
+    all_cols = master_cols + [c for c in con.table("unt").columns[:-1] if c not in master_cols]
+    filled = ", ".join(f"COALESCE({sql_ident(c)}, '') AS {sql_ident(c)}" for c in all_cols)
+
+    # Same rule as merge_frames: each key's primary is its first non-Untitled row, else
+    # its first row, and rows without a key only keep the first
+    con.execute(f"""
+        CREATE TEMP TABLE combined AS
+        WITH unioned AS (
+            SELECT *, 0 AS __src FROM master UNION ALL BY NAME SELECT *, 1 AS __src FROM unt
+        ), keyed AS (
+            SELECT {filled}, __src, __row FROM unioned
+        ), keyed_dup AS (
+            SELECT *, {duplicate_key_sql()} AS __key FROM keyed
+        )
+        SELECT *,
+            row_number() OVER w AS __rank,
+            count(*) OVER (PARTITION BY __key) AS __count,
+            first_value(SourceCatalog) OVER w AS __primary_catalog
+        FROM keyed_dup
+        WINDOW w AS (
+            PARTITION BY __key
+            ORDER BY {preferred_sql('SourceCatalog', '__key')} DESC, __src, __row
+        )
+    """)
+    print(f"🧩 Combined rows before dedupe: {con.table('combined').shape[0]}")
+
+    # Output columns as merge_frames assigns them: replaced in place, else appended
+    computed = {
+        "DuplicateKey": "__key",
+        "IsPrimary": "CASE WHEN __rank = 1 THEN 'Yes' ELSE 'No' END",
+        "PrimaryCatalog": "__primary_catalog",
+    }
+    out_cols = all_cols + [c for c in computed if c not in all_cols]
+    out = ", ".join(f"{computed.get(c, sql_ident(c))} AS {sql_ident(c)}" for c in out_cols)
+
+    sort_cols = [sql_ident(c) for c in SORT_COLUMNS if c in all_cols]
+    new_master = con.sql(
+        f"SELECT {out} FROM combined WHERE __rank = 1 ORDER BY {', '.join(sort_cols + ['__src', '__row'])}"
+    )
+    duplicates_report = con.sql(f"SELECT {out} FROM combined WHERE __count > 1 ORDER BY __src, __row")
+    dup_groups = con.sql("SELECT count(DISTINCT __key) FROM combined WHERE __count > 1").fetchone()[0]
+
+    return new_master, duplicates_report, dup_groups
+
+def write_csv(df, path: Path):
+    if duckdb is not None and isinstance(df, duckdb.DuckDBPyRelation):
+        # Empty cells as nulls, which write unquoted like pandas' empty strings
+        df.project(", ".join(f"NULLIF({sql_ident(c)}, '') AS {sql_ident(c)}" for c in df.columns)) \
+            .write_csv(str(path), header=True)
+    elif pa is not None:
+        # Arrow's writer quotes every text field; the values read back unchanged
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        table = table.cast(pa.schema([(f.name, pa.string()) for f in table.schema]))
+        pacsv.write_csv(table, path)
+    else:
+        df.to_csv(path, index=False, encoding="utf-8")
+
+def merge_master_with_untitled(master_path: Path, untitled_path: Path):
+    merged = None
+    if duckdb is not None:
+        try:
+            merged = merge_frames_duckdb(master_path, untitled_path)
+        except duckdb.Error as e:
+            # Input DuckDB's reader won't take the way pandas does (e.g. ragged rows)
+            print(f"⚠️ DuckDB could not load the catalogs, merging with pandas: {str(e).splitlines()[0]}")
+    new_master, duplicates_report, dup_groups = merged or merge_frames(master_path, untitled_path)
+
     print(f"✅ Unique shows in NEW master: {len(new_master)}")
-    print(f"⚠️ Duplicate groups (incl. Untitled): {len(dup_keys)}")
+    print(f"⚠️ Duplicate groups (incl. Untitled): {dup_groups}")
     print(f"   Rows in NEW duplicates report: {len(duplicates_report)}")
 
     # Output paths
@@ -142,8 +291,8 @@ def merge_master_with_untitled(master_path: Path, untitled_path: Path):
     master_out = out_dir / f"NEW_MASTER_merged_shows_{ts}.csv"
     dup_out = out_dir / f"NEW_MASTER_duplicates_report_{ts}.csv"
 
-    new_master.to_csv(master_out, index=False, encoding="utf-8")
-    duplicates_report.to_csv(dup_out, index=False, encoding="utf-8")
+    write_csv(new_master, master_out)
+    write_csv(duplicates_report, dup_out)
 
     print(f"💾 Wrote NEW master catalog:    {master_out}")
     print(f"💾 Wrote NEW duplicates report: {dup_out}")
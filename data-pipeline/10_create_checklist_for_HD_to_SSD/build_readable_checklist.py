@@ -1,88 +1,169 @@
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4, landscape
 from reportlab.lib.units import cm
-from reportlab.platypus import (
-    SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
-)
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.textsplit import wordSplit
+from reportlab.pdfgen import canvas
+from reportlab.platypus import Paragraph
+from reportlab.lib.styles import getSampleStyleSheet
 import pandas as pd
+from collections import Counter
+from functools import lru_cache
+from itertools import count
 
-# Load master CSV (update path if needed)
-path = "/Users/ko/Desktop/NEW_MASTER_merged_shows_2025-11-06_2113.csv"
-df = pd.read_csv(path, dtype=str, keep_default_na=False)
+# Output PDF
+output_path = "/Users/ko/Desktop/Unique_Shows_Checklist.pdf"
+
+# Page geometry: 0.8cm margins plus the 6pt frame padding a SimpleDocTemplate adds,
+# with the table centred in the frame as platypus placed it
+page_w, page_h = landscape(A4)
+frame_x = 0.8*cm + 6
+frame_top, frame_bottom = page_h - 0.8*cm - 6, 0.8*cm + 6
+frame_w = page_w - 2*frame_x
+
+# Column widths tuned for wrapping
+col_widths = [0.8*cm, 3.5*cm, 2*cm, 5*cm, 10*cm, 2*cm]
+table_w = sum(col_widths)
+table_x = frame_x + (frame_w - table_w) / 2
+col_x = [table_x + sum(col_widths[:i]) for i in range(len(col_widths))]
+
+# Cell text: 6pt Helvetica on 7pt leading, inside 6pt/3pt cell padding. Rows are never
+# shorter than the 10pt checkbox on a 12pt line, which also sets the header height.
+PAD_X, PAD_Y = 6, 3
+FONT, FONT_SIZE, LEADING = "Helvetica", 6, 7
+BOX_SIZE, LINE_LEADING = 10, 12
+MIN_ROW_H = LINE_LEADING + 2*PAD_Y
+header = ["☐", "Artist", "Show Date", "Folder Name", "Folder Path", "Size"]
+row_colors = [colors.whitesmoke, colors.lightgrey]
 
-# Normalize columns
-df.columns = [c.strip() for c in df.columns]
+# Artist and date cells repeat across rows, so each distinct (column, text) is wrapped
+# once (bounded, so a long catalog of one-off paths can't grow it): whitespace collapsed
+# and broken anywhere on the line, as wordWrap='CJK' did
+@lru_cache(maxsize=4096)
+def wrapped(column, text):
+    text = " ".join(text.split())
+    if not text:
+        return ()
+    return tuple(line for _, line in wordSplit(text, [col_widths[column] - 2*PAD_X], FONT, FONT_SIZE))
 
-# Keep required columns
+def row_height(cells):
+    return max(MIN_ROW_H, max(map(len, cells))*LEADING + 2*PAD_Y)
+
+def draw_rows(c, top, rows):
+    """One page's share of a drive's table: header, striped rows, then the grid."""
+    heights = [MIN_ROW_H] + [h for h, _ in rows]
+    tops = [top]
+    for h in heights:
+        tops.append(tops[-1] - h)
+    bottom = tops[-1]
+
+    c.setFillColor(colors.grey)
+    c.rect(table_x, tops[1], table_w, MIN_ROW_H, stroke=0, fill=1)
+    for i in range(len(rows)):
+        c.setFillColor(row_colors[i % 2])
+        c.rect(table_x, tops[i + 2], table_w, heights[i + 1], stroke=0, fill=1)
+
+    tx = c.beginText()
+    tx.setFillColor(colors.whitesmoke)
+    tx.setFont("Helvetica-Bold", 7, LINE_LEADING)
+    for x, label in zip(col_x, header):
+        tx.setTextOrigin(x + PAD_X, top - PAD_Y - 7)
+        tx.textOut(label)
+    tx.setFillColor(colors.black)
+    for row_top, (_, cells) in zip(tops[1:], rows):
+        tx.setFont(FONT, BOX_SIZE, LINE_LEADING)
+        tx.setTextOrigin(col_x[0] + PAD_X, row_top - PAD_Y - BOX_SIZE)
+        tx.textOut("☐")
+        tx.setFont(FONT, FONT_SIZE, LEADING)
+        for x, lines in zip(col_x[1:], cells):
+            y = row_top - PAD_Y - FONT_SIZE
+            for line in lines:
+                tx.setTextOrigin(x + PAD_X, y)
+                tx.textOut(line)
+                y -= LEADING
+    c.drawText(tx)
+
+    c.setStrokeColor(colors.grey)
+    c.setLineWidth(0.25)
+    c.setLineCap(1)
+    c.lines([(table_x, y, table_x + table_w, y) for y in tops[1:-1]]
+            + [(x, top, x, bottom) for x in col_x[1:]])
+    c.rect(table_x, bottom, table_w, top - bottom, stroke=1, fill=0)
+
+# Required columns
 columns = ["Artist", "ShowDate", "FolderName", "FolderPath", "TotalSizeHuman"]
-df = df[["SourceCatalog"] + columns]
+needed = {"SourceCatalog", *columns}
 
-# Group by SourceCatalog
-groups = df.groupby("SourceCatalog")
+# Load master CSV (update path if needed) a chunk at a time, parsing only the required columns
+path = "/Users/ko/Desktop/NEW_MASTER_merged_shows_2025-11-06_2113.csv"
+CHUNK_ROWS = 50_000
 
-# Output PDF
-output_path = "/Users/ko/Desktop/Unique_Shows_Checklist.pdf"
-doc = SimpleDocTemplate(
-    output_path,
-    pagesize=landscape(A4),
-    leftMargin=0.8*cm, rightMargin=0.8*cm,
-    topMargin=0.8*cm, bottomMargin=0.8*cm
-)
+def read_chunks(wanted):
+    for chunk in pd.read_csv(path, dtype=str, keep_default_na=False,
+                             usecols=lambda c: c.strip() in wanted, chunksize=CHUNK_ROWS):
+        # Normalize columns
+        chunk.columns = [c.strip() for c in chunk.columns]
+        yield chunk
+
+# First pass reads SourceCatalog alone: each drive's heading shows its count up front
+show_counts = Counter()
+for chunk in read_chunks({"SourceCatalog"}):
+    show_counts.update(chunk["SourceCatalog"].to_numpy())
 
 styles = getSampleStyleSheet()
-wrap_style = ParagraphStyle(
-    "wrapped",
-    fontName="Helvetica",
-    fontSize=6,          # small font for better fit
-    leading=7,
-    wordWrap='CJK',      # enables wrapping
-    alignment=0          # left align
-)
-
-story = []
-
-for catalog, data in groups:
-    show_count = len(data)
-
-    # Heading with total number of shows for this drive
-    heading_text = f"<b>{catalog} — Unique Shows Checklist ({show_count} shows)</b>"
-    story.append(Paragraph(heading_text, styles["Heading2"]))
-    story.append(Spacer(1, 0.25*cm))
-
-    # Table header
-    table_data = [["☐", "Artist", "Show Date", "Folder Name", "Folder Path", "Size"]]
-
-    # Table rows
-    for _, row in data.iterrows():
-        wrapped_row = [
-            "☐",
-            Paragraph(row["Artist"], wrap_style),
-            Paragraph(row["ShowDate"], wrap_style),
-            Paragraph(row["FolderName"], wrap_style),
-            Paragraph(row["FolderPath"], wrap_style),
-            Paragraph(row["TotalSizeHuman"], wrap_style),
-        ]
-        table_data.append(wrapped_row)
-
-    # Column widths tuned for wrapping
-    col_widths = [0.8*cm, 3.5*cm, 2*cm, 5*cm, 10*cm, 2*cm]
-
-    table = Table(table_data, repeatRows=1, colWidths=col_widths)
-    table.setStyle(TableStyle([
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 7),
-        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-        ('INNERGRID', (0, 0), (-1, -1), 0.25, colors.grey),
-        ('BOX', (0, 0), (-1, -1), 0.25, colors.grey),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1),
-            [colors.whitesmoke, colors.lightgrey]),
-    ]))
-
-    story.append(table)
-    story.append(PageBreak())
-
-doc.build(story)
+heading_style = styles["Heading2"]
+
+c = canvas.Canvas(output_path, pagesize=landscape(A4))
+form_ids = count()
+
+class Section:
+    """One drive's checklist. Rows arrive in file order, so each page is drawn into a form
+    as soon as it fills and only that page's rows are held; the forms are placed in drive
+    order once the whole file has been read."""
+    def __init__(self, catalog):
+        # Heading with total number of shows for this drive
+        heading_text = f"<b>{catalog} — Unique Shows Checklist ({show_counts[catalog]} shows)</b>"
+        self.heading = Paragraph(heading_text, heading_style)
+        _, self.heading_h = self.heading.wrapOn(c, frame_w, frame_top - frame_bottom)
+        self.y = frame_top - self.heading_h - heading_style.spaceAfter - 0.25*cm
+        self.forms, self.rows, self.used = [], [], MIN_ROW_H
+
+    def add(self, row):
+        # Fill each page with as many whole rows as fit under the repeated header; a row
+        # taller than a whole page still gets its own page
+        if self.used + row[0] > self.y - frame_bottom and (self.rows or self.y != frame_top):
+            self.end_page()
+        self.rows.append(row)
+        self.used += row[0]
+
+    def end_page(self):
+        name = None  # the first page can end up holding just the heading
+        if self.rows:
+            name = f"rows{next(form_ids)}"
+            c.beginForm(name)
+            draw_rows(c, self.y, self.rows)
+            c.endForm()
+        self.forms.append(name)
+        self.y, self.rows, self.used = frame_top, [], MIN_ROW_H
+
+    def draw(self):
+        self.end_page()
+        self.heading.drawOn(c, frame_x, frame_top - self.heading_h)
+        for name in self.forms:
+            if name:
+                c.doForm(name)
+            c.showPage()
+
+# Second pass wraps each chunk straight onto its drive's pages and then drops it
+sections = {}
+for chunk in read_chunks(needed):
+    wrapped_cols = [[wrapped(i, text) for text in chunk[col].to_numpy()] for i, col in enumerate(columns, 1)]
+    for catalog, cells in zip(chunk["SourceCatalog"].to_numpy(), zip(*wrapped_cols)):
+        section = sections.get(catalog) or sections.setdefault(catalog, Section(catalog))
+        section.add((row_height(cells), cells))
+
+# One section per drive, in sorted order
+for catalog in sorted(sections):
+    sections.pop(catalog).draw()
+
+c.save()
 print(f"✅ New checklist created with counts per drive: {output_path}")
@@ -28,14 +28,27 @@ Screenshot resolution behaviour (this version):
 """
 
 import csv
+import os
 import subprocess
 import json
+import math
+import re
+import selectors
 import shlex
+import sqlite3
+import threading
 from pathlib import Path
-from typing import Optional, List, Tuple
-from io import StringIO
+from typing import Iterator, Optional, List, Tuple
+from itertools import islice
 from datetime import datetime
-from functools import lru_cache
+from functools import lru_cache, wraps
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import pandas as pd  # vectorized CSV parse, drive filter and CanonicalID (falls back to csv)
+except Exception:
+    pd = None
 
 # ========= CONFIG YOU CAN TWEAK =========
 
@@ -88,8 +101,26 @@ MAX_DIM = 1280
 # Deinterlace: DVDs are often interlaced, so True is a sensible default
 DEINTERLACE = False
 
+# How many ffmpeg captures run at once. Each one is an independent ffmpeg process
+# decoding one video file's shots, so this tracks the core count; 1 captures serially (debugging).
+CAPTURE_WORKERS = os.cpu_count() or 1
+
+# How many ffprobe calls run at once while probing a drive's files up front.
+# ffprobe mostly waits on the drive reading file headers, so this can exceed the core count.
+PROBE_WORKERS = 16
+
+# ffprobe results persist here between runs, keyed by file path, mtime and size,
+# so re-runs over the same drive skip probing. None disables the cache.
+PROBE_CACHE: Optional[Path] = Path("~/.cache/screenshots_probe.sqlite")
+
+# Probe results are committed in batches of this many new entries
+PROBE_CACHE_COMMIT_EVERY = 100
+
 # ========= END CONFIG =========
 
+# DRIVE_FILTER lowercased once, for the per-row match
+_DRIVE_FILTER_LC = DRIVE_FILTER.lower() if DRIVE_FILTER else ""
+
 
 def canonical_id(row: dict) -> str:
     """Pick a canonical ID for filenames: checksum if present, else ShowID."""
@@ -99,15 +130,34 @@ def canonical_id(row: dict) -> str:
     return (row.get("ShowID") or "").strip()
 
 
+def shot_file_name(cid: str, shot_idx: int) -> str:
+    """Screenshot filename for a show's shot: <CanonicalID>_NN.<ext>."""
+    return f"{cid}_{shot_idx+1:02d}.{OUTPUT_FORMAT.lower()}"
+
+
+def all_shots_exist(cid: str, existing: set) -> bool:
+    """True if every one of the show's SHOTS_PER_SHOW screenshots is in `existing`."""
+    return SHOTS_PER_SHOW > 0 and all(shot_file_name(cid, i) in existing for i in range(SHOTS_PER_SHOW))
+
+
 def row_matches_drive(row: dict) -> bool:
     """
     Return True if this row belongs to the target drive, based on MasterDriveName.
     Uses case-insensitive substring match.
     """
-    if not DRIVE_FILTER:
-        return True
-    md = (row.get("MasterDriveName") or "").lower()
-    return DRIVE_FILTER.lower() in md
+    return (not _DRIVE_FILTER_LC) or _DRIVE_FILTER_LC in (row.get("MasterDriveName") or "").lower()
+
+
+@lru_cache(maxsize=65536)
+def _stat(p: Path) -> Optional[os.stat_result]:
+    """
+    Cached p.stat(), None if it fails. Shows share video files, and the probe
+    cache keys on the same stat, so each file is stat'ed once per run.
+    """
+    try:
+        return p.stat()
+    except OSError:
+        return None
 
 
 def get_rep_video_paths(row: dict) -> List[Path]:
@@ -126,81 +176,254 @@ def get_rep_video_paths(row: dict) -> List[Path]:
 
     parts = [p.strip() for p in rep_files.split(";") if p.strip()]
     folder_path = Path(folder)
-    paths: List[Path] = []
 
+    # One stat per file: it both checks the file exists and gives its size
+    sized: List[Tuple[Path, int]] = []
     for name in parts:
         p = folder_path / name
-        if p.exists():
-            paths.append(p)
+        st = _stat(p)
+        if st is not None:
+            sized.append((p, st.st_size))
 
-    if not paths:
+    if not sized:
         return []
 
     # Filter out very small files (likely menus)
     size_threshold = int(MIN_VIDEO_FILE_SIZE_MB * 1024 * 1024)
-    large_paths = [p for p in paths if p.stat().st_size >= size_threshold]
+    large = [(p, size) for p, size in sized if size >= size_threshold]
 
     # If we found any "large" files, prefer those; otherwise keep all
-    if large_paths:
-        paths = large_paths
+    if large:
+        sized = large
 
     # Sort by size descending so we tend to use big/main files first
-    paths.sort(key=lambda x: x.stat().st_size, reverse=True)
+    sized.sort(key=lambda t: t[1], reverse=True)
 
-    return paths
+    return [p for p, _ in sized]
 
 
-@lru_cache(maxsize=1024)
-def get_file_duration_sec(file_path: Path) -> int:
+_PROBE_DB = {"conn": None, "opened": False, "pending": 0}
+_PROBE_DB_LOCK = threading.Lock()
+
+
+def _probe_db() -> Optional[sqlite3.Connection]:
+    """Open the probe cache on first use. Returns None if caching is off or unavailable."""
+    if not _PROBE_DB["opened"]:
+        _PROBE_DB["opened"] = True
+        if PROBE_CACHE:
+            try:
+                db_path = PROBE_CACHE.expanduser()
+                db_path.parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(str(db_path), timeout=30, check_same_thread=False)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS probe ("
+                    " path TEXT NOT NULL, mtime INTEGER NOT NULL, size INTEGER NOT NULL,"
+                    " kind TEXT NOT NULL, value TEXT NOT NULL,"
+                    " PRIMARY KEY (path, mtime, size, kind))"
+                )
+                conn.commit()
+                _PROBE_DB["conn"] = conn
+            except Exception as e:
+                print(f"⚠️ Probe cache unavailable ({e}); probing every file.")
+    return _PROBE_DB["conn"]
+
+
+def flush_probe_cache():
+    """Commit any probe results still waiting for a batch commit."""
+    with _PROBE_DB_LOCK:
+        conn = _PROBE_DB["conn"]
+        if conn is not None and _PROBE_DB["pending"]:
+            try:
+                conn.commit()
+            except Exception:
+                pass
+            _PROBE_DB["pending"] = 0
+
+
+def disk_memo(kind: str, failed):
+    """
+    Persist a file_path -> probe result function in PROBE_CACHE, keyed by the
+    file's resolved path, mtime and size, so a changed file is probed again.
+    Results equal to `failed` are stored as an empty value, so a file that
+    cannot be probed is not retried until it changes. fn returns None when
+    the probe could not run at all (e.g. no ffprobe); that reads as `failed`
+    but is never stored.
     """
-    Use ffprobe to get the duration (in seconds) of a single file.
-    Returns 0 on failure.
+    def decorate(fn):
+        @wraps(fn)
+        def wrapper(file_path: Path):
+            with _PROBE_DB_LOCK:
+                conn = _probe_db()
+            if conn is None:
+                value = fn(file_path)
+                return failed if value is None else value
+            try:
+                st = _stat(file_path)
+                key = (str(file_path.resolve()), st.st_mtime_ns, st.st_size, kind)
+                with _PROBE_DB_LOCK:
+                    hit = conn.execute(
+                        "SELECT value FROM probe WHERE path=? AND mtime=? AND size=? AND kind=?", key
+                    ).fetchone()
+            except Exception:
+                value = fn(file_path)
+                return failed if value is None else value
+            if hit:
+                if not hit[0]:
+                    return failed
+                value = json.loads(hit[0])
+                return tuple(value) if isinstance(value, list) else value
+
+            value = fn(file_path)
+            if value is None:
+                return failed
+            with _PROBE_DB_LOCK:
+                try:
+                    # OR IGNORE: a concurrent run may have stored the same key first
+                    stored = "" if value == failed else json.dumps(value)
+                    conn.execute("INSERT OR IGNORE INTO probe VALUES (?, ?, ?, ?, ?)", key + (stored,))
+                    _PROBE_DB["pending"] += 1
+                    if _PROBE_DB["pending"] >= PROBE_CACHE_COMMIT_EVERY:
+                        conn.commit()
+                        _PROBE_DB["pending"] = 0
+                except Exception:
+                    pass
+            return value
+        return wrapper
+    return decorate
+
+
+_PROBE_FAILED = {"duration": 0, "width": None, "height": None}
+
+
+@lru_cache(maxsize=None)  # unbounded: prefetch_probes fills it before planning reads it
+@disk_memo("probe", failed=_PROBE_FAILED)
+def get_file_probe(file_path: Path) -> dict:
+    """
+    Use one ffprobe call to get the duration (in whole seconds) and the
+    (width, height) of the first video stream of a single file.
+    Returns {"duration": 0, "width": None, "height": None} on failure;
+    fields ffprobe could not report keep those values. Returns None if
+    ffprobe itself could not be started.
     """
     cmd = [
         "ffprobe",
         "-v", "error",
-        "-show_entries", "format=duration",
-        "-of", "default=nw=1:nk=1",
+        "-select_streams", "v:0",
+        "-show_entries", "format=duration:stream=width,height",
+        "-of", "default=nw=1",
         str(file_path),
     ]
     try:
-        out = subprocess.check_output(cmd, text=True).strip()
-        if not out:
-            return 0
-        return int(float(out))
+        out = subprocess.check_output(cmd)  # raw bytes: no locale decode
+    except OSError:
+        return None
     except Exception:
-        return 0
+        return dict(_PROBE_FAILED)
+
+    # key=value lines (width, height, duration); keys are kept so a file with
+    # no video stream still reads as a duration alone
+    fields = {}
+    for line in out.splitlines():
+        key, sep, value = line.partition(b"=")
+        if sep:
+            fields.setdefault(key.strip(), value.strip())
+
+    probe = dict(_PROBE_FAILED)
+    try:
+        probe["duration"] = int(float(fields[b"duration"]))
+    except (KeyError, ValueError):
+        pass
+    for key in ("width", "height"):
+        try:
+            probe[key] = int(fields[key.encode()]) or None
+        except (KeyError, ValueError):
+            pass
+    return probe
+
+
+def get_file_duration_sec(file_path: Path) -> int:
+    """Duration (in seconds) of a single file, 0 on failure."""
+    return get_file_probe(file_path)["duration"]
 
 
-@lru_cache(maxsize=1024)
 def get_file_dimensions(file_path: Path) -> Tuple[Optional[int], Optional[int]]:
+    """(width, height) for the first video stream, (None, None) on failure."""
+    probe = get_file_probe(file_path)
+    return probe["width"], probe["height"]
+
+
+def _row_measures_file(row: dict, file_path: Path) -> bool:
     """
-    Use ffprobe to get (width, height) for the first video stream.
-    Returns (None, None) on failure.
+    True if the row's Width/Height/DurationSec were measured on file_path:
+    the catalog records them per show, summing durations over VOB segments,
+    so they only describe a file when it is the show's sole RepVideoFiles entry.
     """
-    cmd = [
-        "ffprobe",
-        "-v", "error",
-        "-select_streams", "v:0",
-        "-show_entries", "stream=width,height",
-        "-of", "json",
-        str(file_path),
-    ]
+    parts = [p.strip() for p in (row.get("RepVideoFiles") or "").split(";") if p.strip()]
+    return len(parts) == 1 and Path((row.get("FolderPath") or "").strip()) / parts[0] == file_path
+
+
+def _row_int(row: dict, key: str) -> Optional[int]:
+    """Positive whole number from a CSV column, or None if empty/invalid."""
     try:
-        out = subprocess.check_output(cmd, text=True)
-        data = json.loads(out)
-        streams = data.get("streams") or []
-        if not streams:
-            return None, None
-        s = streams[0]
-        w = int(s.get("width") or 0) or None
-        h = int(s.get("height") or 0) or None
-        return w, h
+        return int(float((row.get(key) or "").strip())) or None
     except Exception:
-        return None, None
+        return None
+
+
+def get_duration(row: dict, file_path: Path) -> int:
+    """Duration (in seconds) of file_path: the CSV's DurationSec if it applies, else ffprobe."""
+    if _row_measures_file(row, file_path):
+        duration = _row_int(row, "DurationSec")
+        if duration:
+            return duration
+    return get_file_duration_sec(file_path)
+
+
+def get_dimensions(row: dict, file_path: Path) -> Tuple[Optional[int], Optional[int]]:
+    """(width, height) of file_path: the CSV's Width/Height if they apply, else ffprobe."""
+    if _row_measures_file(row, file_path):
+        w, h = _row_int(row, "Width"), _row_int(row, "Height")
+        if w and h:
+            return w, h
+    return get_file_dimensions(file_path)
 
 
-def build_scale_filter_for_file(file_path: Path) -> Optional[str]:
+def _needs_probe(row: dict, file_path: Path) -> bool:
+    """True if get_duration/get_dimensions would have to run ffprobe for file_path."""
+    if not _row_measures_file(row, file_path):
+        return True
+    return not (_row_int(row, "DurationSec") and _row_int(row, "Width") and _row_int(row, "Height"))
+
+
+def prefetch_probes(shows: List[Tuple[str, dict]], existing: set):
+    """
+    Probe, PROBE_WORKERS at a time, every video file the shows' shots will be
+    taken from and their catalog rows cannot describe, so the planning loop
+    finds each probe already cached instead of waiting on ffprobe per show.
+    Shows whose screenshots are all in `existing` are left out.
+    """
+    paths = {}  # ordered set
+    for cid, row in shows:
+        if not cid or all_shots_exist(cid, existing):
+            continue
+        files = get_rep_video_paths(row)
+        if not files:
+            continue
+        for shot_idx in range(SHOTS_PER_SHOW):
+            video_file = choose_file_for_shot(files, shot_idx, SHOTS_PER_SHOW)
+            if _needs_probe(row, video_file):
+                paths[video_file] = None
+
+    workers = min(PROBE_WORKERS, len(paths))
+    if workers <= 1:
+        return  # nothing to overlap; the planning loop probes as it goes
+    print(f"🔎 Probing {len(paths)} video file(s) with {workers} worker(s)")
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        list(ex.map(get_file_probe, paths))
+
+
+def build_scale_filter_for_file(row: dict, file_path: Path) -> Optional[str]:
     """
     Build a scale filter that:
       - Does NOT upscale.
@@ -210,7 +433,7 @@ def build_scale_filter_for_file(file_path: Path) -> Optional[str]:
     if MAX_DIM is None or MAX_DIM <= 0:
         return None
 
-    w, h = get_file_dimensions(file_path)
+    w, h = get_dimensions(row, file_path)
     if not w or not h:
         return None
 
@@ -227,41 +450,53 @@ def build_scale_filter_for_file(file_path: Path) -> Optional[str]:
         return f"scale=-1:{MAX_DIM}"
 
 
-def compute_shot_time_for_file(file_path: Path, shot_idx: int) -> int:
+def _make_shot_time_fn(cfg, fb):
     """
-    Decide at what second to capture a screenshot within THIS file.
-
-    If duration is known and SHOT_TIMES entry is 0–1,
-    treat as a fraction of duration. Otherwise, use FALLBACK_SECONDS.
+    Specialize the shot-time rule for one SHOT_TIMES / FALLBACK_SECONDS pair:
+    the config values are parsed once, leaving duration -> second.
     """
-    duration = get_file_duration_sec(file_path)
-    cfg = SHOT_TIMES[shot_idx % len(SHOT_TIMES)]
-
     try:
         val = float(cfg)
     except Exception:
         val = 0.5  # middle-ish default
-
-    # Case 1: valid duration and fractional value
-    if duration > 0 and 0 < val <= 1.0:
-        t = int(duration * val)
-        if t < 3 and duration > 6:
-            t = 3
-        if t >= duration:
-            t = max(1, duration - 1)
-        return t
-
-    # Case 2: fallback seconds
-    fb = FALLBACK_SECONDS[shot_idx % len(FALLBACK_SECONDS)]
     try:
-        t = int(fb)
+        fb_t = int(fb)
     except Exception:
-        t = 30
-
-    if duration > 0 and t >= duration:
-        t = max(1, duration - 1)
+        fb_t = 30
+    fractional = 0 < val <= 1.0
+
+    def shot_time(duration: int) -> int:
+        if duration <= 0:
+            return fb_t
+        if fractional:
+            # Case 1: valid duration and fractional value
+            t = int(duration * val)
+            if t < 3 and duration > 6:
+                t = 3
+        else:
+            # Case 2: fallback seconds
+            t = fb_t
+        return max(1, duration - 1) if t >= duration else t
+
+    return shot_time
+
+
+# One shot-time function per shot index; the two lists cycle independently,
+# so the table repeats every lcm of their lengths
+_SHOT_TIME_FNS = [
+    _make_shot_time_fn(SHOT_TIMES[i % len(SHOT_TIMES)], FALLBACK_SECONDS[i % len(FALLBACK_SECONDS)])
+    for i in range(math.lcm(len(SHOT_TIMES), len(FALLBACK_SECONDS)))
+]
+
+
+def compute_shot_time_for_file(row: dict, file_path: Path, shot_idx: int) -> int:
+    """
+    Decide at what second to capture a screenshot within THIS file.
 
-    return t
+    If duration is known and SHOT_TIMES entry is 0–1,
+    treat as a fraction of duration. Otherwise, use FALLBACK_SECONDS.
+    """
+    return _SHOT_TIME_FNS[shot_idx % len(_SHOT_TIME_FNS)](get_duration(row, file_path))
 
 
 def choose_file_for_shot(files: List[Path], shot_idx: int, total_shots: int) -> Path:
@@ -288,6 +523,13 @@ def choose_file_for_shot(files: List[Path], shot_idx: int, total_shots: int) ->
     return files[index]
 
 
+# Aspect tokens, searched in this order so a 16:9 token wins over a 4:3 one
+_ASPECT_PATTERNS = [
+    (re.compile(r"16:9|1\.7[78]"), "16/9"),
+    (re.compile(r"4:3|1\.3[34]"), "4/3"),
+]
+
+
 def parse_aspect_hint(row: dict) -> Optional[str]:
     """
     Try to derive an aspect ratio hint (for setdar) from CSV metadata.
@@ -315,10 +557,9 @@ def parse_aspect_hint(row: dict) -> Optional[str]:
 
     txt = raw.lower().replace(" ", "")
     # direct ratios / common values
-    if "16:9" in txt or "1.78" in txt or "1.77" in txt:
-        return "16/9"
-    if "4:3" in txt or "1.33" in txt or "1.34" in txt:
-        return "4/3"
+    for pattern, hint in _ASPECT_PATTERNS:
+        if pattern.search(txt):
+            return hint
 
     try:
         if txt.endswith(":1"):
@@ -328,20 +569,42 @@ def parse_aspect_hint(row: dict) -> Optional[str]:
             return "16/9"
         if 1.2 <= val <= 1.4:
             return "4/3"
-    except Exception:
+    except ValueError:
         pass
 
     return None
 
 
+# ffmpeg muxer/encoder for writing one OUTPUT_FORMAT image to a pipe
+PIPE_FORMAT_ARGS = {
+    "jpg": ["-f", "image2pipe", "-c:v", "mjpeg"],
+    "png": ["-f", "image2pipe", "-c:v", "png"],
+    "webp": ["-f", "webp"],
+}
+
+
 def build_ffmpeg_cmd(
     input_path: Path,
-    output_path: Path,
-    t_second: int,
+    shots: List[Tuple[str, int]],
     aspect_hint: Optional[str] = None,
+    scale_filter: Optional[str] = None,
 ):
     """
-    Build an ffmpeg command line for one screenshot.
+    Build one ffmpeg command line for all screenshots taken from one file.
+
+    Each (output_url, t_second) shot is its own input, fast-seeked with -ss
+    before -i, and mapped to its own single-frame output, so a file's shots
+    cost one ffmpeg start-up instead of one per shot. Outputs are written as
+    OUTPUT_FORMAT images to output_url (a pipe:N in capture_shots).
+    scale_filter comes from build_scale_filter_for_file, worked out once
+    per file when the captures are planned.
+
+    An input -ss already seeks the demuxer to the keyframe before t_second
+    and decodes only from there, so the frame is exact without decoding the
+    start of the file. Audio, subtitle and data streams are discarded at
+    each input, since only the video stream is read. (One input with
+    select='eq(t,...)+...' would open the file once, but decode every frame
+    up to the last shot - far more work than a few seeks on a long VOB.)
 
     We:
       - optional deinterlace (yadif)
@@ -357,44 +620,311 @@ def build_ffmpeg_cmd(
     if aspect_hint in ("16/9", "4/3"):
         vf_filters.append(f"setdar={aspect_hint}")
 
-    scale_filter = build_scale_filter_for_file(input_path)
     if scale_filter:
         vf_filters.append(scale_filter)
 
+    output_args = []
+    if vf_filters:
+        vf_arg = ",".join(vf_filters)
+        output_args += ["-vf", vf_arg]
+
+    if OUTPUT_FORMAT.lower() == "jpg":
+        output_args += ["-q:v", str(JPEG_QUALITY)]
+    elif OUTPUT_FORMAT.lower() == "webp":
+        output_args += ["-quality", str(WEBP_QUALITY)]
+    output_args += PIPE_FORMAT_ARGS[OUTPUT_FORMAT.lower()]
+
     cmd = [
         "ffmpeg",
         "-hide_banner",
         "-loglevel", "warning",
-        "-ss", str(t_second),
-        "-i", str(input_path),
-        "-frames:v", "1",
     ]
+    for _, t_second in shots:
+        cmd += ["-ss", str(t_second), "-an", "-sn", "-dn", "-i", str(input_path)]
+
+    for input_idx, (output_url, _) in enumerate(shots):
+        if len(shots) > 1:
+            cmd += ["-map", f"{input_idx}:v:0"]
+        cmd += ["-frames:v", "1"] + output_args
+        cmd.append(str(output_url))
+    return cmd
 
-    if vf_filters:
-        vf_arg = ",".join(vf_filters)
-        cmd += ["-vf", vf_arg]
 
-    if OUTPUT_FORMAT.lower() == "jpg":
-        cmd += ["-q:v", str(JPEG_QUALITY)]
-    elif OUTPUT_FORMAT.lower() == "webp":
-        cmd += ["-quality", str(WEBP_QUALITY)]
+# Only the end of ffmpeg's stderr is kept for the report; a broken file can
+# log a warning per packet
+FFMPEG_STDERR_TAIL = 4096
+
+
+def run_ffmpeg_to_pipes(cmd_for, count: int) -> Tuple[int, str, List[bytes]]:
+    """
+    Run cmd_for(pipe_urls), an ffmpeg command writing `count` outputs, with
+    one OS pipe per output (ffmpeg muxes outputs in parallel, so they cannot
+    share stdout). Returns (returncode, the last FFMPEG_STDERR_TAIL bytes of
+    stderr as text, bytes of each output).
+    """
+    pipes = [os.pipe() for _ in range(count)]
+    try:
+        proc = subprocess.Popen(
+            cmd_for([f"pipe:{w}" for _, w in pipes]),
+            stdin=subprocess.DEVNULL,  # parallel ffmpegs must not read the terminal
+            stdout=subprocess.DEVNULL,  # images come back on their own pipes
+            stderr=subprocess.PIPE,
+            pass_fds=[w for _, w in pipes],
+        )
+    except Exception:
+        for r, w in pipes:
+            os.close(r)
+            os.close(w)
+        raise
+    for _, w in pipes:
+        os.close(w)
+
+    # Drain every pipe as ffmpeg fills it, so no output can block on a full pipe
+    chunks = {r: [] for r, _ in pipes}
+    stderr_fd = proc.stderr.fileno()
+    stderr_tail = bytearray()
+    with selectors.DefaultSelector() as sel:
+        for fd in [stderr_fd, *chunks]:
+            sel.register(fd, selectors.EVENT_READ)
+        while sel.get_map():
+            for key, _ in sel.select():
+                data = os.read(key.fd, 1 << 16)
+                if not data:
+                    sel.unregister(key.fd)
+                elif key.fd == stderr_fd:
+                    stderr_tail += data
+                    if len(stderr_tail) > 2 * FFMPEG_STDERR_TAIL:
+                        del stderr_tail[:-FFMPEG_STDERR_TAIL]
+                else:
+                    chunks[key.fd].append(data)
+    for r, _ in pipes:
+        os.close(r)
+    proc.stderr.close()
+    returncode = proc.wait()
+
+    stderr_text = bytes(stderr_tail[-FFMPEG_STDERR_TAIL:]).decode(errors="replace")
+    return returncode, stderr_text, [b"".join(chunks[r]) for r, _ in pipes]
+
+
+def capture_shots(task: dict) -> List[dict]:
+    """
+    Run one ffmpeg for a file's planned screenshots, write each image it
+    produced to its out_path, and return their report rows. Status is per
+    shot: ERROR_FFMPEG only for shots that got no image (one bad seek can
+    fail the run after the other images were written), else OK, or
+    OK_WITH_WARN when ffmpeg logged anything or exited non-zero.
+    """
+    shots = task["shots"]
+
+    def cmd_for(urls):
+        shot_specs = [(url, shot["log"]["ShotTimeSec"]) for url, shot in zip(urls, shots)]
+        cmd = build_ffmpeg_cmd(
+            task["file"], shot_specs, aspect_hint=task["aspect_hint"], scale_filter=task["scale_filter"]
+        )
+        # Uncomment for debugging:
+        # print("    ffmpeg cmd:", " ".join(shlex.quote(c) for c in cmd))
+        return cmd
+
+    try:
+        returncode, stderr_text, images = run_ffmpeg_to_pipes(cmd_for, len(shots))
+    except OSError as e:
+        return [{**shot["log"], "Status": "ERROR_FFMPEG", "ErrorMessage": str(e)} for shot in shots]
+
+    # Images are written here rather than by ffmpeg; a shot with no frame gets no file
+    for shot, image in zip(shots, images):
+        if image:
+            shot["out_path"].write_bytes(image)
+
+    stderr_text = stderr_text.strip()
+    if returncode != 0:
+        stderr_text = stderr_text or f"ffmpeg exited with status {returncode}"
+
+    if stderr_text:
+        status = "OK_WITH_WARN"
+    else:
+        status = "OK"
+
+    rows = []
+    for shot, image in zip(shots, images):
+        if image:
+            rows.append({**shot["log"], "Status": status, "ErrorMessage": stderr_text})
+        else:
+            err_msg = stderr_text or "ffmpeg wrote no image"
+            rows.append({**shot["log"], "Status": "ERROR_FFMPEG", "ErrorMessage": err_msg})
+    return rows
 
-    cmd.append(str(output_path))
-    return cmd
 
+class CaptureQueue:
+    """
+    Runs capture_shots for each task as soon as it is planned, with up to
+    `workers` ffmpeg processes at once. The Python side only waits on ffmpeg,
+    so threads are enough to keep the cores busy.
+
+    Finished captures come back in submission order. At most 2 * workers
+    tasks are outstanding: submit waits on the oldest beyond that, so
+    planning stays just ahead of the captures and only their rows are held.
+    """
 
-def load_csv_rows(path: Path):
+    def __init__(self, workers: int):
+        self._pool = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+        self._limit = 2 * workers
+        self._queue = deque()
+        self.submitted = 0
+
+    def submit(self, task: dict) -> List[Tuple[dict, List[dict]]]:
+        """Start task; return the (task, report rows) of captures finished so far."""
+        self.submitted += 1
+        if self._pool is None:
+            return [(task, capture_shots(task))]
+        self._queue.append((task, self._pool.submit(capture_shots, task)))
+        return self._collect(len(self._queue) - self._limit)
+
+    def close(self) -> List[Tuple[dict, List[dict]]]:
+        """Wait for every outstanding capture and return them."""
+        done = self._collect(len(self._queue))
+        if self._pool is not None:
+            self._pool.shutdown()
+        return done
+
+    def _collect(self, wait_for: int) -> List[Tuple[dict, List[dict]]]:
+        done = []
+        while self._queue and (len(done) < wait_for or self._queue[0][1].done()):
+            task, future = self._queue.popleft()
+            done.append((task, future.result()))
+        return done
+
+
+def iter_csv_rows(path: Path) -> Iterator[dict]:
     """
-    Load CSV rows, stripping any NUL characters that might break csv.reader.
+    Stream CSV rows a line at a time, stripping any NUL characters that
+    might break csv.reader.
     """
     if not path.exists():
         raise FileNotFoundError(f"CSV not found: {path}")
 
     with path.open("r", encoding="utf-8", errors="replace", newline="") as f:
-        text = f.read().replace("\0", "")
-    sio = StringIO(text)
-    reader = csv.DictReader(sio)
-    return list(reader)
+        yield from csv.DictReader(line.replace("\0", "") for line in f)
+
+
+def iter_filtered_rows(path: Path) -> Iterator[dict]:
+    """Stream only the CSV rows that belong to the target drive."""
+    return (row for row in iter_csv_rows(path) if row_matches_drive(row))
+
+
+class _NulStrippedText:
+    """Text file wrapper whose reads drop NUL characters (pandas' C parser ends a field at NUL)."""
+
+    def __init__(self, f):
+        self._f = f
+
+    def read(self, size: int = -1) -> str:
+        return self._f.read(size).replace("\0", "")
+
+
+def _load_drive_shows_pandas(path: Path, limit: Optional[int]) -> List[Tuple[str, dict]]:
+    if not path.exists():
+        raise FileNotFoundError(f"CSV not found: {path}")
+
+    with path.open("r", encoding="utf-8", errors="replace", newline="") as f:
+        try:
+            df = pd.read_csv(_NulStrippedText(f), dtype=str, keep_default_na=False, na_filter=False)
+        except pd.errors.EmptyDataError:
+            return []
+
+    def col(name):
+        return df[name] if name in df.columns else pd.Series("", index=df.index, dtype=object)
+
+    if _DRIVE_FILTER_LC:
+        df = df[col("MasterDriveName").str.lower().str.contains(_DRIVE_FILTER_LC, regex=False)]
+    if limit:
+        df = df.head(limit)
+
+    checksum = col("ChecksumSHA1").str.strip()
+    cids = checksum.where(checksum != "", col("ShowID").str.strip())
+    return list(zip(cids.tolist(), df.to_dict("records")))
+
+
+def load_drive_shows(path: Path) -> List[Tuple[str, dict]]:
+    """
+    Return (CanonicalID, row) for each CSV row on the target drive, in file
+    order, up to the optional MAX_SHOWS limit (for testing).
+
+    With pandas the CSV is parsed, drive-filtered and keyed in vectorized
+    passes; without it (or for ragged rows pandas rejects) rows are streamed
+    through csv.DictReader, stopping early once the limit is met.
+    """
+    limit = MAX_SHOWS if MAX_SHOWS and MAX_SHOWS > 0 else None
+    if pd is not None:
+        try:
+            return _load_drive_shows_pandas(path, limit)
+        except pd.errors.ParserError:
+            pass
+    return [(canonical_id(row), row) for row in islice(iter_filtered_rows(path), limit)]
+
+
+REPORT_FIELDNAMES = [
+    "ShowID",
+    "CanonicalID",
+    "Artist",
+    "MasterDriveName",
+    "FolderPath",
+    "RepVideoFiles",
+    "VideoFileUsed",
+    "ShotIndex",
+    "ShotTimeSec",
+    "Status",
+    "ErrorMessage",
+]
+
+
+class ReportWriter:
+    """
+    Capture report CSV written while the run goes, in show/shot order.
+
+    Every row takes the next slot; a row whose capture is still pending
+    reserves its slot and is filled in later. Rows go to disk as soon as all
+    earlier slots have, and the file is line-buffered, so a crash keeps
+    everything up to the first unfinished capture.
+    """
+
+    def __init__(self, f):
+        self._writer = csv.DictWriter(f, fieldnames=REPORT_FIELDNAMES)
+        self._writer.writeheader()
+        self._slots = 0
+        self._next = 0
+        self._waiting = {}
+        self.rows_written = 0
+
+    def reserve(self) -> int:
+        """Take the next slot for a row that is not known yet."""
+        slot = self._slots
+        self._slots += 1
+        return slot
+
+    def put(self, slot: int, row: dict):
+        """Fill a reserved slot, writing out every row that is now in order."""
+        self._waiting[slot] = row
+        while self._next in self._waiting:
+            self._writer.writerow(self._waiting.pop(self._next))
+            self._next += 1
+            self.rows_written += 1
+
+    def add(self, row: dict):
+        """Append a row that is already final."""
+        self.put(self.reserve(), row)
+
+
+def record_captures(report: ReportWriter, done: List[Tuple[dict, List[dict]]]) -> int:
+    """Put finished captures' rows in the report; returns how many shots succeeded."""
+    ok = 0
+    for task, logs in done:
+        for shot, log in zip(task["shots"], logs):
+            report.put(shot["slot"], log)
+            if log["Status"] == "ERROR_FFMPEG":
+                print(f"  ❌ ffmpeg failed for {shot['out_name']}: {log['ErrorMessage']}")
+            else:
+                ok += 1
+    return ok
 
 
 def main():
@@ -403,59 +933,88 @@ def main():
         return
 
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    _stat.cache_clear()  # sizes and mtimes are read fresh for each run
     REPORT_DIR.mkdir(parents=True, exist_ok=True)
 
-    # Load rows from CSV (NUL-safe)
+    # Load the chosen drive's rows from CSV (NUL-safe), with their CanonicalIDs
     try:
-        rows = load_csv_rows(MASTER_CSV_PATH)
+        sample_rows = load_drive_shows(MASTER_CSV_PATH)
     except Exception as e:
         print(f"❌ Failed to load CSV: {e}")
         return
 
-    if not rows:
-        print("❌ No rows found in CSV.")
-        return
-
-    # Filter rows for the chosen drive
-    drive_rows = [r for r in rows if row_matches_drive(r)]
-    if not drive_rows:
-        print(f"❌ No rows matched drive filter: {DRIVE_FILTER}")
+    if not sample_rows:
+        # Only read back the first row to tell an empty CSV from a filter miss
+        if next(iter_csv_rows(MASTER_CSV_PATH), None) is None:
+            print("❌ No rows found in CSV.")
+        else:
+            print(f"❌ No rows matched drive filter: {DRIVE_FILTER}")
         return
 
-    # Apply optional MAX_SHOWS limit (for testing)
-    if MAX_SHOWS and MAX_SHOWS > 0:
-        sample_rows = drive_rows[:MAX_SHOWS]
-    else:
-        sample_rows = drive_rows
-
     total_shows = len(sample_rows)
     print(f"🎬 Processing {total_shows} show(s) for drive filter: {DRIVE_FILTER!r}")
 
+    # Screenshots already on disk, listed once; it stands in for a stat per shot.
+    # Captures written during this run are all in `planned` below.
+    existing = {p.name for p in OUTPUT_DIR.iterdir()}
+
+    # Warm the probe caches for the whole drive before planning shot times
+    prefetch_probes(sample_rows, existing)
+
     # Prepare logging
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     report_path = REPORT_DIR / f"screenshot_capture_report_{timestamp}.csv"
 
-    log_rows = []
+    report_file = report_path.open("w", encoding="utf-8", newline="", buffering=1)
+    report = ReportWriter(report_file)
     total_attempts = 0
     total_ok = 0
 
-    for idx, row in enumerate(sample_rows, start=1):
-        cid = canonical_id(row)
-        files = get_rep_video_paths(row)
-        aspect_hint = parse_aspect_hint(row)
+    # ffmpeg runs (one per show and video file), started as each show is planned,
+    # up to CAPTURE_WORKERS at a time. Each shot reserves a report slot so the
+    # report stays in show/shot order.
+    workers = 1 if MAX_SHOWS == 1 else CAPTURE_WORKERS
+    captures = CaptureQueue(workers)
+    planned = set()
 
+    for idx, (cid, row) in enumerate(sample_rows, start=1):
         print(f"\n[{idx}/{total_shows}] ShowID={row.get('ShowID')} CanonicalID={cid}")
         print(f"  Artist: {row.get('Artist')}")
         print(f"  MasterDriveName: {row.get('MasterDriveName')}")
         print(f"  Folder: {row.get('FolderPath')}")
         print(f"  RepVideoFiles: {row.get('RepVideoFiles')}")
+
+        # Done already (or planned for an earlier row with the same CanonicalID):
+        # skip before touching the drive, so re-runs never stat or probe it
+        if cid and (all_shots_exist(cid, existing) or all_shots_exist(cid, planned)):
+            msg = "All screenshots already exist; skipping show."
+            print(f"  ⏭️  {msg}")
+            for shot_idx in range(SHOTS_PER_SHOW):
+                total_attempts += 1
+                report.add({
+                    "ShowID": row.get("ShowID"),
+                    "CanonicalID": cid,
+                    "Artist": row.get("Artist"),
+                    "MasterDriveName": row.get("MasterDriveName"),
+                    "FolderPath": row.get("FolderPath"),
+                    "RepVideoFiles": row.get("RepVideoFiles"),
+                    "VideoFileUsed": "",
+                    "ShotIndex": shot_idx + 1,
+                    "ShotTimeSec": "",
+                    "Status": "SKIP_EXISTS",
+                    "ErrorMessage": msg,
+                })
+            continue
+
+        files = get_rep_video_paths(row)
+        aspect_hint = parse_aspect_hint(row)
         print(f"  Candidate files (after size filter): {len(files)}")
         print(f"  Aspect hint: {aspect_hint}")
 
         if not cid:
             msg = "No CanonicalID (missing ChecksumSHA1 and ShowID)."
             print(f"  ⚠️ Skipping show: {msg}")
-            log_rows.append({
+            report.add({
                 "ShowID": row.get("ShowID"),
                 "CanonicalID": "",
                 "Artist": row.get("Artist"),
@@ -476,7 +1035,7 @@ def main():
                 "or all are below MIN_VIDEO_FILE_SIZE_MB threshold."
             )
             print(f"  ⚠️ Skipping show: {msg}")
-            log_rows.append({
+            report.add({
                 "ShowID": row.get("ShowID"),
                 "CanonicalID": cid,
                 "Artist": row.get("Artist"),
@@ -491,20 +1050,21 @@ def main():
             })
             continue
 
+        pending = {}  # video_file -> shots still to capture from it
         for shot_idx in range(SHOTS_PER_SHOW):
             total_attempts += 1
 
             video_file = choose_file_for_shot(files, shot_idx, SHOTS_PER_SHOW)
-            t_sec = compute_shot_time_for_file(video_file, shot_idx)
+            t_sec = compute_shot_time_for_file(row, video_file, shot_idx)
 
-            ext = OUTPUT_FORMAT.lower()
-            out_name = f"{cid}_{shot_idx+1:02d}.{ext}"
+            out_name = shot_file_name(cid, shot_idx)
             out_path = OUTPUT_DIR / out_name
 
-            if out_path.exists():
+            # A shot planned for an earlier row (same CanonicalID) counts as existing
+            if out_name in existing or out_name in planned:
                 msg = "Output file already exists; skipping to avoid overwrite."
                 print(f"  ⏭️  {msg} ({out_name})")
-                log_rows.append({
+                report.add({
                     "ShowID": row.get("ShowID"),
                     "CanonicalID": cid,
                     "Artist": row.get("Artist"),
@@ -519,26 +1079,14 @@ def main():
                 })
                 continue
 
-            cmd = build_ffmpeg_cmd(video_file, out_path, t_sec, aspect_hint=aspect_hint)
             print(f"  📸 Capturing {out_name} from {video_file.name} at {t_sec}s")
-            # Uncomment for debugging:
-            # print("    ffmpeg cmd:", " ".join(shlex.quote(c) for c in cmd))
 
-            try:
-                result = subprocess.run(
-                    cmd,
-                    check=True,
-                    capture_output=True,
-                    text=True,
-                )
-
-                stderr_text = (result.stderr or "").strip()
-                if stderr_text:
-                    status = "OK_WITH_WARN"
-                else:
-                    status = "OK"
-
-                log_rows.append({
+            planned.add(out_name)
+            pending.setdefault(video_file, []).append({
+                "slot": report.reserve(),
+                "out_name": out_name,
+                "out_path": out_path,
+                "log": {
                     "ShowID": row.get("ShowID"),
                     "CanonicalID": cid,
                     "Artist": row.get("Artist"),
@@ -548,50 +1096,29 @@ def main():
                     "VideoFileUsed": str(video_file),
                     "ShotIndex": shot_idx + 1,
                     "ShotTimeSec": t_sec,
-                    "Status": status,
-                    "ErrorMessage": stderr_text,
-                })
-                total_ok += 1
+                },
+            })
 
-            except subprocess.CalledProcessError as e:
-                err_msg = (e.stderr or "").strip() if e.stderr else str(e)
-                print(f"  ❌ ffmpeg failed for {out_name}: {err_msg}")
-                log_rows.append({
-                    "ShowID": row.get("ShowID"),
-                    "CanonicalID": cid,
-                    "Artist": row.get("Artist"),
-                    "MasterDriveName": row.get("MasterDriveName"),
-                    "FolderPath": row.get("FolderPath"),
-                    "RepVideoFiles": row.get("RepVideoFiles"),
-                    "VideoFileUsed": str(video_file),
-                    "ShotIndex": shot_idx + 1,
-                    "ShotTimeSec": t_sec,
-                    "Status": "ERROR_FFMPEG",
-                    "ErrorMessage": err_msg,
-                })
+        for video_file, shots in pending.items():
+            total_ok += record_captures(report, captures.submit({
+                "file": video_file,
+                "aspect_hint": aspect_hint,
+                "scale_filter": build_scale_filter_for_file(row, video_file),
+                "shots": shots,
+            }))
+
+    # Wait for the captures still running
+    total_ok += record_captures(report, captures.close())
+    if captures.submitted:
+        print(f"\n🎞️ Ran {captures.submitted} ffmpeg capture(s) with up to {workers} worker(s)")
 
-    # Write report CSV
-    if log_rows:
-        fieldnames = [
-            "ShowID",
-            "CanonicalID",
-            "Artist",
-            "MasterDriveName",
-            "FolderPath",
-            "RepVideoFiles",
-            "VideoFileUsed",
-            "ShotIndex",
-            "ShotTimeSec",
-            "Status",
-            "ErrorMessage",
-        ]
-        with report_path.open("w", encoding="utf-8", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(log_rows)
+    flush_probe_cache()
 
+    report_file.close()
+    if report.rows_written:
         print(f"\n🧾 Capture report written to: {report_path}")
     else:
+        report_path.unlink()
         print("\nℹ️ No log rows created (no shows processed?).")
 
     print(f"✅ Done. Screenshots (if any) are in: {OUTPUT_DIR}")